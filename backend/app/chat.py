@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-import json
 import re
 import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
+from typing import Any
+
+from pydantic import TypeAdapter
 
 from .config import Settings
 from .db import Database, RetrievedUnit
@@ -21,9 +25,15 @@ from .query_context import (
     unit_matches_query,
     unit_matches_prakran,
 )
-from .retrieval import RetrievalService
+from .retrieval import RetrievalResult, RetrievalService
 from .text_quality import is_garbled_text, safe_display_text
 
+# Serializes citation lists with pydantic's compiled serializer instead of
+# model_dump() + json.dumps.
+_CITATION_LIST_ADAPTER = TypeAdapter(list[Citation])
+_RECOVERY_MAX_CONCURRENCY = 4
+_SEARCH_MAX_CONCURRENCY = 4
+
 
 class ChatService:
     _DIGIT_TRANS = str.maketrans(
@@ -46,7 +56,13 @@ class ChatService:
         self.pricing_catalog = pricing_catalog
         self.fx_service = fx_service
 
-    def respond(self, payload: ChatRequest) -> ChatResponse:
+    def respond(
+        self,
+        payload: ChatRequest,
+        on_progress: Callable[[str, Any], None] | None = None,
+    ) -> ChatResponse:
+        # on_progress(event, data) is called from this (worker) thread as soon as
+        # intermediate results exist, e.g. citations before answer generation.
         usage_collector = UsageCollector()
         detected = detect_style(payload.message)
         answer_style = resolve_output_style(payload.style_mode, detected)
@@ -109,13 +125,29 @@ class ChatService:
                 "query_context": self._context_payload(query_context),
             }
         else:
-            plan = self.llm.plan_query(
-                question=payload.message,
-                conversation_context=recent_messages,
-                memory_summary=memory_summary,
-                memory_key_facts=memory_key_facts,
-                usage_collector=usage_collector,
-            )
+            # The raw question is always the first retrieval query, so it is searched
+            # while the planner call is in flight; latency is max(plan, search).
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="plan") as pool:
+                plan_future = pool.submit(
+                    self.llm.plan_query,
+                    question=payload.message,
+                    conversation_context=recent_messages,
+                    memory_summary=memory_summary,
+                    memory_key_facts=memory_key_facts,
+                    usage_collector=usage_collector,
+                )
+                question_query = payload.message.strip()
+                prefetched = {
+                    question_query: self._search_query(
+                        question_query,
+                        style=detected,
+                        top_k=top_k,
+                        granth=retrieval_granth,
+                        prakran=retrieval_prakran,
+                        usage_collector=usage_collector,
+                    )
+                }
+                plan = plan_future.result()
             query_list = self._build_agentic_query_list(payload.message, plan, query_context)
             aggregated = self._agentic_retrieve(
                 queries=query_list,
@@ -124,6 +156,7 @@ class ChatService:
                 granth=retrieval_granth,
                 prakran=retrieval_prakran,
                 usage_collector=usage_collector,
+                prefetched=prefetched,
             )
             merged = self._merge_reference_hits(aggregated, query_context, top_k=top_k)
             constrained = self._apply_query_constraints(merged, query_context)
@@ -152,9 +185,7 @@ class ChatService:
                 citations = []
                 not_found = True
             else:
-                recovered_pairs = [
-                    (self._recover_unit_if_needed(unit, usage_collector=usage_collector), score) for unit, score in strong_results
-                ]
+                recovered_pairs = self._recover_units(strong_results, usage_collector=usage_collector)
                 explainable_pairs = [pair for pair in recovered_pairs if not is_garbled_text(pair[0].chunk_text)]
 
                 citations = []
@@ -186,6 +217,9 @@ class ChatService:
                         )
                     )
 
+                if on_progress is not None:
+                    on_progress("citations", citations)
+
                 if not explainable_pairs:
                     answer = (
                         "I found related pages, but their text still appears unreadable from current extraction. "
@@ -328,20 +362,37 @@ class ChatService:
         granth: str | None,
         prakran: str | None,
         usage_collector: UsageCollector | None = None,
+        prefetched: dict[str, list[RetrievalResult]] | None = None,
     ) -> list[tuple[RetrievedUnit, float]]:
         score_by_id: dict[str, float] = {}
         unit_by_id: dict[str, RetrievedUnit] = {}
 
-        per_query_limit = max(top_k * 2, 8)
-        for query_idx, query in enumerate(queries):
-            results = self.retrieval.search(
-                query=query,
+        # Each search waits on a query embedding round-trip, so the planner's
+        # sub-queries are searched side by side; scores are still fused in query order.
+        results_by_query = dict(prefetched or {})
+        pending = [query for query in dict.fromkeys(queries) if query not in results_by_query]
+
+        def search(query: str) -> list[RetrievalResult]:
+            return self._search_query(
+                query,
                 style=style,
-                top_k=per_query_limit,
+                top_k=top_k,
                 granth=granth,
                 prakran=prakran,
                 usage_collector=usage_collector,
             )
+
+        if len(pending) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(_SEARCH_MAX_CONCURRENCY, len(pending)),
+                thread_name_prefix="search",
+            ) as pool:
+                results_by_query.update(zip(pending, pool.map(search, pending)))
+        else:
+            results_by_query.update((query, search(query)) for query in pending)
+
+        for query_idx, query in enumerate(queries):
+            results = results_by_query[query]
             query_weight = 1.0 / (1.0 + (query_idx * 0.35))
             for rank, item in enumerate(results, start=1):
                 rank_bonus = 1.0 / (40 + rank)
@@ -352,6 +403,25 @@ class ChatService:
         ranked_ids = sorted(score_by_id.keys(), key=lambda item_id: score_by_id[item_id], reverse=True)
         return [(unit_by_id[item_id], score_by_id[item_id]) for item_id in ranked_ids[: max(top_k, 4)]]
 
+    def _search_query(
+        self,
+        query: str,
+        *,
+        style: str,
+        top_k: int,
+        granth: str | None,
+        prakran: str | None,
+        usage_collector: UsageCollector | None = None,
+    ) -> list[RetrievalResult]:
+        return self.retrieval.search(
+            query=query,
+            style=style,
+            top_k=max(top_k * 2, 8),
+            granth=granth,
+            prakran=prakran,
+            usage_collector=usage_collector,
+        )
+
     def _merge_reference_hits(
         self,
         ranked: list[tuple[RetrievedUnit, float]],
@@ -672,6 +742,30 @@ class ChatService:
             f"Grounding: {grounding}"
         )
 
+    def _recover_units(
+        self,
+        pairs: list[tuple[RetrievedUnit, float]],
+        *,
+        usage_collector: UsageCollector | None = None,
+    ) -> list[tuple[RetrievedUnit, float]]:
+        # Each garbled unit costs an OCR and possibly a decode round-trip; with several
+        # of them the calls overlap instead of running back to back.
+        garbled = sum(1 for unit, _ in pairs if is_garbled_text(unit.chunk_text))
+        if garbled <= 1 or not self.settings.allow_openai_page_ocr_recovery:
+            return [(self._recover_unit_if_needed(unit, usage_collector=usage_collector), score) for unit, score in pairs]
+
+        with ThreadPoolExecutor(
+            max_workers=min(_RECOVERY_MAX_CONCURRENCY, garbled),
+            thread_name_prefix="recover",
+        ) as pool:
+            units = list(
+                pool.map(
+                    lambda unit: self._recover_unit_if_needed(unit, usage_collector=usage_collector),
+                    [unit for unit, _ in pairs],
+                )
+            )
+        return [(unit, score) for unit, (_, score) in zip(units, pairs)]
+
     def _recover_unit_if_needed(self, unit: RetrievedUnit, *, usage_collector: UsageCollector | None = None) -> RetrievedUnit:
         if not is_garbled_text(unit.chunk_text):
             return unit
@@ -745,7 +839,7 @@ class ChatService:
             role="assistant",
             text=assistant_text,
             style_tag=assistant_style,
-            citations_json=json.dumps([citation.model_dump() for citation in citations], ensure_ascii=False),
+            citations_json=_CITATION_LIST_ADAPTER.dump_json(citations).decode("utf-8"),
             cost_json=(cost_summary.model_dump_json() if cost_summary else None),
         )
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -23,10 +24,13 @@ class Settings:
         ]
     )
 
+    cors_origins: list[str] = field(default_factory=lambda: ["http://localhost:3000", "http://127.0.0.1:3000"])
+
     openai_api_key: str | None = None
     openai_chat_model: str = "gpt-5.2"
     openai_embedding_model: str = "text-embedding-3-large"
     openai_vision_model: str = "gpt-5.2"
+    openai_max_retries: int = 3
     pricing_catalog_path: Path = field(default_factory=lambda: Path(__file__).resolve().parent / "pricing_catalog.json")
     fx_primary_url: str = "https://api.frankfurter.app/latest?from=USD&to=INR"
     fx_refresh_hours: int = 6
@@ -35,12 +39,17 @@ class Settings:
     retrieval_top_k: int = 6
     minimum_grounding_score: float = 0.015
     request_rate_limit_per_min: int = 40
+    chat_cache_max_entries: int = 2000
+    chat_cache_ttl_seconds: int = 300
+    chat_workers: int = 16
+    pdf_accel_redirect_prefix: str = ""
 
     allow_debug_payloads: bool = True
     enable_ocr_fallback: bool = True
     ocr_quality_threshold: float = 0.22
     ocr_force_on_garbled: bool = True
     ingest_openai_ocr_max_pages: int = 200
+    ingest_parse_workers: int = 4
     allow_openai_page_ocr_recovery: bool = True
 
     @property
@@ -101,6 +110,7 @@ def _load_dotenv_file(path: Path) -> None:
         os.environ.setdefault(key, value)
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     workspace = Path(__file__).resolve().parents[2]
     env_candidates = [workspace / "backend" / ".env", workspace / ".env"]
@@ -117,6 +127,7 @@ def get_settings() -> Settings:
     settings.openai_chat_model = os.getenv("OPENAI_CHAT_MODEL", settings.openai_chat_model)
     settings.openai_embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", settings.openai_embedding_model)
     settings.openai_vision_model = os.getenv("OPENAI_VISION_MODEL", settings.openai_vision_model)
+    settings.openai_max_retries = _to_int(os.getenv("OPENAI_MAX_RETRIES"), settings.openai_max_retries)
     settings.fx_primary_url = os.getenv("FX_PRIMARY_URL", settings.fx_primary_url)
     settings.fx_refresh_hours = _to_int(os.getenv("FX_REFRESH_HOURS"), settings.fx_refresh_hours)
     settings.usd_inr_fallback_rate = _to_float(os.getenv("USD_INR_FALLBACK_RATE"), settings.usd_inr_fallback_rate)
@@ -129,6 +140,7 @@ def get_settings() -> Settings:
         settings.pricing_catalog_path = custom
 
     settings.corpus_dirs = _split_csv(os.getenv("CORPUS_DIRS"), settings.corpus_dirs)
+    settings.cors_origins = _split_csv(os.getenv("CORS_ORIGINS"), settings.cors_origins)
 
     settings.retrieval_top_k = _to_int(os.getenv("RETRIEVAL_TOP_K"), settings.retrieval_top_k)
     settings.minimum_grounding_score = _to_float(
@@ -138,6 +150,11 @@ def get_settings() -> Settings:
         os.getenv("REQUEST_RATE_LIMIT_PER_MIN"), settings.request_rate_limit_per_min
     )
 
+    settings.chat_cache_max_entries = _to_int(os.getenv("CHAT_CACHE_MAX_ENTRIES"), settings.chat_cache_max_entries)
+    settings.chat_cache_ttl_seconds = _to_int(os.getenv("CHAT_CACHE_TTL_SECONDS"), settings.chat_cache_ttl_seconds)
+    settings.chat_workers = _to_int(os.getenv("CHAT_WORKERS"), settings.chat_workers)
+    settings.pdf_accel_redirect_prefix = os.getenv("PDF_ACCEL_REDIRECT_PREFIX", settings.pdf_accel_redirect_prefix)
+
     settings.allow_debug_payloads = _to_bool(os.getenv("ALLOW_DEBUG_PAYLOADS"), settings.allow_debug_payloads)
     settings.enable_ocr_fallback = _to_bool(os.getenv("ENABLE_OCR_FALLBACK"), settings.enable_ocr_fallback)
     settings.ocr_quality_threshold = _to_float(os.getenv("OCR_QUALITY_THRESHOLD"), settings.ocr_quality_threshold)
@@ -145,6 +162,7 @@ def get_settings() -> Settings:
     settings.ingest_openai_ocr_max_pages = _to_int(
         os.getenv("INGEST_OPENAI_OCR_MAX_PAGES"), settings.ingest_openai_ocr_max_pages
     )
+    settings.ingest_parse_workers = _to_int(os.getenv("INGEST_PARSE_WORKERS"), settings.ingest_parse_workers)
     settings.allow_openai_page_ocr_recovery = _to_bool(
         os.getenv("ALLOW_OPENAI_PAGE_OCR_RECOVERY"), settings.allow_openai_page_ocr_recovery
     )
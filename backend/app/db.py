@@ -8,6 +8,14 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterator
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Stored JSON columns are decoded on every retrieved unit / memory / cost row.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 @dataclass(slots=True)
 class RetrievedUnit:
@@ -225,16 +233,18 @@ class Database:
             conn.execute("DELETE FROM chopai_units")
             conn.execute("DELETE FROM chopai_fts")
 
-    def upsert_units(self, units: list[dict[str, Any]]) -> None:
+    def upsert_units(self, units: list[dict[str, Any]], *, rebuild_fts: bool = True) -> None:
         if not units:
             return
 
-        prepared_units: list[dict[str, Any]] = []
-        for unit in units:
-            row = dict(unit)
-            row.setdefault("prakran_number", None)
-            row.setdefault("prakran_confidence", None)
-            prepared_units.append(row)
+        # Ingestion records already carry every column; only older callers that omit
+        # the prakran fields get a filled-in copy instead of one copy per row.
+        prepared_units = [
+            unit
+            if "prakran_number" in unit and "prakran_confidence" in unit
+            else {"prakran_number": None, "prakran_confidence": None, **unit}
+            for unit in units
+        ]
 
         with self.connect() as conn:
             conn.executemany(
@@ -270,15 +280,23 @@ class Database:
                 prepared_units,
             )
 
-            # Rebuild FTS index for deterministic runs.
-            conn.execute("DELETE FROM chopai_fts")
-            conn.execute(
-                """
-                INSERT INTO chopai_fts (id, chunk_text, normalized_text, translit_hi_latn, translit_gu_latn, granth_name, prakran_name)
-                SELECT id, chunk_text, normalized_text, translit_hi_latn, translit_gu_latn, granth_name, prakran_name
-                FROM chopai_units
-                """
-            )
+            if rebuild_fts:
+                self._rebuild_fts(conn)
+
+    def rebuild_fts_index(self) -> None:
+        with self.connect() as conn:
+            self._rebuild_fts(conn)
+
+    def _rebuild_fts(self, conn: sqlite3.Connection) -> None:
+        # Rebuild FTS index for deterministic runs.
+        conn.execute("DELETE FROM chopai_fts")
+        conn.execute(
+            """
+            INSERT INTO chopai_fts (id, chunk_text, normalized_text, translit_hi_latn, translit_gu_latn, granth_name, prakran_name)
+            SELECT id, chunk_text, normalized_text, translit_hi_latn, translit_gu_latn, granth_name, prakran_name
+            FROM chopai_units
+            """
+        )
 
     def count_units(self) -> int:
         with self.connect() as conn:
@@ -603,7 +621,7 @@ class Database:
             return None
 
         try:
-            key_facts = json.loads(row["key_facts_json"] or "[]")
+            key_facts = _json_loads(row["key_facts_json"] or "[]")
             if not isinstance(key_facts, list):
                 key_facts = []
         except Exception:
@@ -856,7 +874,7 @@ class Database:
             if not raw:
                 continue
             try:
-                payload = json.loads(raw)
+                payload = _json_loads(raw)
             except Exception:
                 continue
             if not isinstance(payload, dict):
@@ -925,7 +943,7 @@ def _row_to_unit(row: dict[str, Any]) -> RetrievedUnit:
         prakran_confidence=float(row["prakran_confidence"]) if row.get("prakran_confidence") is not None else None,
         chopai_number=row.get("chopai_number"),
         prakran_chopai_index=int(row["prakran_chopai_index"]) if row.get("prakran_chopai_index") is not None else None,
-        chopai_lines=json.loads(row["chopai_lines_json"]),
+        chopai_lines=_json_loads(row["chopai_lines_json"]),
         meaning_text=row["meaning_text"],
         language_script=row["language_script"],
         page_number=int(row["page_number"]),
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import multiprocessing
 import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass
+from itertools import groupby
+from operator import attrgetter
 from pathlib import Path
 
 from .config import Settings
@@ -14,6 +21,17 @@ from .pdf_extract import PDFExtractionError, PageText, extract_pdf_pages
 from .text_quality import is_garbled_text, likely_misencoded_indic_text
 from .vector_store import VectorStore
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+_UPSERT_BATCH_SIZE = 1024
+_MAX_STORE_BATCHES_IN_FLIGHT = 2
+
+# SHA-1 state pre-seeded with the namespace bytes; uuid.uuid5 rebuilds this per call.
+_UNIT_ID_NAMESPACE_HASH = hashlib.sha1(uuid.NAMESPACE_URL.bytes, usedforsecurity=False)
+
 
 @dataclass(slots=True)
 class IngestStats:
@@ -43,68 +61,76 @@ class IngestionService:
         if self.vectors.available:
             self.vectors.clear()
 
-        all_records: list[dict] = []
-        vector_ids: list[str] = []
-        vector_docs: list[str] = []
-        vector_metas: list[dict] = []
-
-        corpus_files = self._collect_corpus_files()
-        for pdf_path in corpus_files:
-            try:
-                pages, ocr_count = extract_pdf_pages(
-                    pdf_path,
-                    enable_ocr_fallback=self.settings.enable_ocr_fallback,
-                    ocr_quality_threshold=self.settings.ocr_quality_threshold,
-                    force_on_garbled=self.settings.ocr_force_on_garbled,
-                )
-
-                openai_ocr_count = 0
-                if self.settings.enable_ocr_fallback and self.settings.allow_openai_page_ocr_recovery:
-                    remaining_ocr_budget = max(0, self.settings.ingest_openai_ocr_max_pages - stats.ocr_pages)
-                    if remaining_ocr_budget > 0:
-                        pages, openai_ocr_count = self._recover_pages_with_openai(
-                            pdf_path=pdf_path,
-                            pages=pages,
-                            budget=remaining_ocr_budget,
-                        )
-
-                stats.ocr_pages += ocr_count + openai_ocr_count
-                units = parse_pdf_to_units(pdf_path, pages)
-                units = self._fill_unknown_prakrans(units)
-                normalized_units = self._normalize_units(units)
-                all_records.extend(normalized_units)
-
-                stats.files_processed += 1
-            except PDFExtractionError as exc:
-                stats.failed_files += 1
-                stats.notes.append(str(exc))
-            except Exception as exc:
-                stats.failed_files += 1
-                stats.notes.append(f"Failed {pdf_path}: {exc}")
-
-        if all_records:
-            self.db.upsert_units(all_records)
-            stats.chunks_created = len(all_records)
-
-            if self.vectors.available:
-                for record in all_records:
-                    vector_ids.append(record["id"])
-                    vector_docs.append(record["chunk_text"])
-                    vector_metas.append(
-                        {
-                            "granth_name": record["granth_name"],
-                            "prakran_name": record["prakran_name"],
-                            "source_set": record["source_set"],
-                            "chunk_type": record["chunk_type"],
-                        }
+        pending: list[dict] = []
+        in_flight: deque[Future[int]] = deque()
+
+        # Embedding + upsert of one batch runs on a single writer thread while the
+        # main thread extracts the next PDFs. Batches stay in submission order.
+        # Page text extraction and parsing are pure-Python CPU work, so they fan out
+        # to processes.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-store") as store_pool, ExitStack() as stack:
+            parse_executor = self._new_parse_pool()
+            # Shuts down whichever pool is current at exit; a broken one is replaced below.
+            stack.callback(lambda: parse_executor is not None and parse_executor.shutdown())
+
+            def submit_store(records: list[dict]) -> None:
+                while len(in_flight) >= _MAX_STORE_BATCHES_IN_FLIGHT:
+                    stats.chunks_created += in_flight.popleft().result()
+                in_flight.append(store_pool.submit(self._store_records, records))
+
+            corpus_files = self._collect_corpus_files()
+            for pdf_path in corpus_files:
+                try:
+                    pages, ocr_count = extract_pdf_pages(
+                        pdf_path,
+                        enable_ocr_fallback=self.settings.enable_ocr_fallback,
+                        ocr_quality_threshold=self.settings.ocr_quality_threshold,
+                        force_on_garbled=self.settings.ocr_force_on_garbled,
+                        executor=parse_executor,
                     )
-                embeddings = self.llm.embed_many(vector_docs)
-                self.vectors.upsert(
-                    ids=vector_ids,
-                    texts=vector_docs,
-                    embeddings=embeddings,
-                    metadatas=vector_metas,
-                )
+
+                    openai_ocr_count = 0
+                    if self.settings.enable_ocr_fallback and self.settings.allow_openai_page_ocr_recovery:
+                        remaining_ocr_budget = max(0, self.settings.ingest_openai_ocr_max_pages - stats.ocr_pages)
+                        if remaining_ocr_budget > 0:
+                            pages, openai_ocr_count = self._recover_pages_with_openai(
+                                pdf_path=pdf_path,
+                                pages=pages,
+                                budget=remaining_ocr_budget,
+                            )
+
+                    stats.ocr_pages += ocr_count + openai_ocr_count
+                    units = parse_pdf_to_units(pdf_path, pages, executor=parse_executor)
+                    units = self._fill_unknown_prakrans(units)
+                    normalized_units = self._normalize_units(units)
+                    pending.extend(normalized_units)
+
+                    stats.files_processed += 1
+                except PDFExtractionError as exc:
+                    stats.failed_files += 1
+                    stats.notes.append(str(exc))
+                except Exception as exc:
+                    stats.failed_files += 1
+                    stats.notes.append(f"Failed {pdf_path}: {exc}")
+
+                if _is_broken(parse_executor):
+                    # A dead worker (OOM, a crash inside pypdf) breaks the whole pool;
+                    # the PDF above fell back to in-process work, the rest get a new pool.
+                    parse_executor.shutdown(wait=False, cancel_futures=True)
+                    parse_executor = self._new_parse_pool()
+                    stats.notes.append(f"Parse worker pool failed during {pdf_path}; restarted it")
+
+                if len(pending) >= _UPSERT_BATCH_SIZE:
+                    submit_store(pending)
+                    pending = []
+
+            if pending:
+                submit_store(pending)
+            while in_flight:
+                stats.chunks_created += in_flight.popleft().result()
+
+        if stats.chunks_created:
+            self.db.rebuild_fts_index()
         else:
             stats.notes.append("No chunks were generated. Verify PDF text extraction and parser heuristics.")
 
@@ -119,13 +145,51 @@ class IngestionService:
 
         return stats
 
+    def _store_records(self, records: list[dict]) -> int:
+        self.db.upsert_units(records, rebuild_fts=False)
+
+        if self.vectors.available:
+            vector_ids: list[str] = []
+            vector_docs: list[str] = []
+            vector_metas: list[dict] = []
+            for record in records:
+                vector_ids.append(record["id"])
+                vector_docs.append(record["chunk_text"])
+                vector_metas.append(
+                    {
+                        "granth_name": record["granth_name"],
+                        "prakran_name": record["prakran_name"],
+                        "source_set": record["source_set"],
+                        "chunk_type": record["chunk_type"],
+                    }
+                )
+            embeddings = self.llm.embed_many(vector_docs)
+            self.vectors.upsert(
+                ids=vector_ids,
+                texts=vector_docs,
+                embeddings=embeddings,
+                metadatas=vector_metas,
+            )
+
+        return len(records)
+
+    def _new_parse_pool(self) -> ProcessPoolExecutor | None:
+        if self.settings.ingest_parse_workers <= 1:
+            return None
+        # "spawn" avoids forking a server process that already runs threads.
+        return ProcessPoolExecutor(
+            max_workers=self.settings.ingest_parse_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
     def _collect_corpus_files(self) -> list[Path]:
         files: list[Path] = []
         for corpus_dir in self.settings.corpus_paths:
             if not corpus_dir.exists():
                 continue
-            files.extend(sorted(corpus_dir.glob("*.pdf")))
-        return files
+            files.extend(corpus_dir.glob("*.pdf"))
+        # Largest PDFs first so long extractions start early and don't trail the run.
+        return sorted(files, key=lambda path: (-path.stat().st_size, str(path)))
 
     def _normalize_units(self, units: list[ParsedUnit]) -> list[dict]:
         records: list[dict] = []
@@ -133,7 +197,7 @@ class IngestionService:
             stable_input = (
                 f"{unit.pdf_path}|{unit.page_number}|{idx}|{unit.prakran_name}|{unit.chunk_text[:200]}"
             )
-            item_id = str(uuid.uuid5(uuid.NAMESPACE_URL, stable_input))
+            item_id = _stable_unit_id(stable_input)
 
             records.append(
                 {
@@ -144,7 +208,7 @@ class IngestionService:
                     "prakran_confidence": unit.prakran_confidence,
                     "chopai_number": unit.chopai_number,
                     "prakran_chopai_index": unit.prakran_chopai_index,
-                    "chopai_lines_json": json.dumps(unit.chopai_lines, ensure_ascii=False),
+                    "chopai_lines_json": _dump_chopai_lines(unit.chopai_lines),
                     "meaning_text": unit.meaning_text,
                     "language_script": unit.language_script,
                     "page_number": unit.page_number,
@@ -169,38 +233,45 @@ class IngestionService:
         if budget <= 0 or not self.llm.enabled:
             return pages, 0
 
-        candidates = [
-            page
-            for page in pages
-            if (
-                page.quality_score < self.settings.ocr_quality_threshold
-                or is_garbled_text(page.text)
-                or likely_misencoded_indic_text(page.text)
-            )
-        ]
+        is_gujarati_set = "guj-arth" in str(pdf_path.parent).lower()
+
+        # Scan each page's text once; the flags feed both the filter and the sort key.
+        # The misencoding flag only affects ordering for Gujarati sets, so elsewhere
+        # it is evaluated lazily as the last filter condition.
+        candidates: list[tuple[PageText, bool, bool]] = []
+        threshold = self.settings.ocr_quality_threshold
+        for page in pages:
+            garbled = is_garbled_text(page.text)
+            if is_gujarati_set:
+                gujarati_priority = likely_misencoded_indic_text(page.text)
+                selected = page.quality_score < threshold or garbled or gujarati_priority
+            else:
+                gujarati_priority = False
+                selected = page.quality_score < threshold or garbled or likely_misencoded_indic_text(page.text)
+            if selected:
+                candidates.append((page, garbled, gujarati_priority))
         if not candidates:
             return pages, 0
 
-        is_gujarati_set = "guj-arth" in str(pdf_path.parent).lower()
         # Prioritize Gujarati misencoded pages, then garbled, then lower quality.
         candidates.sort(
-            key=lambda page: (
-                0 if (is_gujarati_set and likely_misencoded_indic_text(page.text)) else 1,
-                0 if is_garbled_text(page.text) else 1,
-                page.quality_score,
+            key=lambda item: (
+                0 if item[2] else 1,
+                0 if item[1] else 1,
+                item[0].quality_score,
             )
         )
         recoverable = candidates[:budget]
 
         replacement_text: dict[int, str] = {}
         recovered_count = 0
-        for page in recoverable:
+        for page, garbled, _ in recoverable:
             ocr_text = normalize_text(self.llm.ocr_pdf_page(str(pdf_path), page.page_number))
             if not ocr_text:
                 continue
 
             # Skip weak OCR outputs unless source page is clearly garbled.
-            if not is_garbled_text(page.text):
+            if not garbled:
                 if is_garbled_text(ocr_text, threshold=0.02) or len(ocr_text) < max(40, int(len(page.text) * 0.5)):
                     continue
 
@@ -231,12 +302,10 @@ class IngestionService:
         if not units:
             return units
 
-        by_pdf: dict[str, list[ParsedUnit]] = {}
-        for unit in units:
-            by_pdf.setdefault(unit.pdf_path, []).append(unit)
-
         max_page_gap = 6
-        for group in by_pdf.values():
+        # Units arrive contiguous per PDF, so the stable sort is a linear pass.
+        for _, group_iter in groupby(sorted(units, key=attrgetter("pdf_path")), key=attrgetter("pdf_path")):
+            group = list(group_iter)
             if not any(not self._is_unknown_prakran_name(item.prakran_name) for item in group):
                 continue
 
@@ -308,6 +377,25 @@ class IngestionService:
         return cleaned in {"unknown prakran", "prakran not parsed", ""}
 
 
+def _is_broken(executor: ProcessPoolExecutor | None) -> bool:
+    # Set once a worker died; every later submit or map on the pool then fails.
+    return executor is not None and bool(getattr(executor, "_broken", False))
+
+
+def _stable_unit_id(stable_input: str) -> str:
+    """Equivalent to ``str(uuid.uuid5(uuid.NAMESPACE_URL, stable_input))``."""
+
+    digest = _UNIT_ID_NAMESPACE_HASH.copy()
+    digest.update(stable_input.encode("utf-8"))
+    return str(uuid.UUID(bytes=digest.digest()[:16], version=5))
+
+
+def _dump_chopai_lines(lines: list[str]) -> str:
+    if orjson is not None:
+        return orjson.dumps(lines).decode("utf-8")
+    return json.dumps(lines, ensure_ascii=False)
+
+
 def _extract_prakran_number_from_name(name: str | None) -> int | None:
     value = (name or "").strip().lower()
     if not value:
@@ -3,7 +3,13 @@ from __future__ import annotations
 import re
 import unicodedata
 from dataclasses import dataclass
-from typing import Literal
+from functools import lru_cache
+from typing import Literal, get_args
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
 
 try:
     from indic_transliteration import sanscript
@@ -15,6 +21,10 @@ except Exception:  # pragma: no cover - optional dependency behavior
 StyleTag = Literal["hi", "gu", "en", "hi_latn", "gu_latn"]
 ConversionMode = Literal["hi", "gu", "en", "hi_latn", "gu_latn", "en_deva", "en_gu"]
 
+# Derived from the Literals so the membership checks below cannot drift from them.
+_STYLE_TAGS: frozenset[str] = frozenset(get_args(StyleTag))
+_LATIN_STYLES: frozenset[str] = frozenset(tag for tag in _STYLE_TAGS if tag == "en" or tag.endswith("_latn"))
+
 _HI_HINTS = {
     "kaise",
     "kya",
@@ -38,34 +48,107 @@ _GU_HINTS = {
 }
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class ScriptCounts:
     devanagari: int = 0
     gujarati: int = 0
     latin: int = 0
 
 
+_WHITESPACE = re.compile(r"\s+")
+_NORMALIZE_CACHE_MAX_LEN = 10_000
+
+
 def normalize_text(text: str) -> str:
-    text = unicodedata.normalize("NFKC", text or "")
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    text = text or ""
+    # Long ingest pages are normalized once; only cache short, repeated strings.
+    if len(text) > _NORMALIZE_CACHE_MAX_LEN:
+        return _normalize_text_uncached(text)
+    return _normalize_text_cached(text)
+
+
+def _normalize_text_uncached(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+_normalize_text_cached = lru_cache(maxsize=4096)(_normalize_text_uncached)
+
+def normalize_lines(text: str) -> list[str]:
+    """``[normalize_text(line) for line in text.splitlines()]`` in one pass over the text."""
+
+    lines = (text or "").splitlines()
+    if not lines:
+        return []
+    # NFKC never maps to or composes across "\n", so the page is normalized as a
+    # whole. str.split() splits on the same whitespace as \s and drops the ends, so
+    # re-joining collapses and strips each line without a regex substitution.
+    joined = unicodedata.normalize("NFKC", "\n".join(lines))
+    return [" ".join(line.split()) for line in joined.split("\n")]
+
+
+_INDIC_DIGITS_TO_ASCII = str.maketrans("०१२३४५६७८९૦૧૨૩૪૫૬૭૮૯", "0123456789" * 2)
+_INDIC_DIGIT = re.compile(r"[०-९૦-૯]")
+
+
+def normalize_digits(text: str) -> str:
+    """Map Devanagari and Gujarati digits to ASCII; other characters are kept."""
+
+    if not text:
+        return ""
+    # str.translate walks the table per code point; most text has no Indic digits.
+    if text.isascii() or not _INDIC_DIGIT.search(text):
+        return text
+    return text.translate(_INDIC_DIGITS_TO_ASCII)
 
 
+_NON_LATIN_LETTERS = re.compile(r"[^A-Za-z]+")
+_VECTOR_COUNT_MIN_LEN = 256
+_DEVANAGARI_RUN = re.compile(r"[\u0900-\u097f]+")
+_GUJARATI_RUN = re.compile(r"[\u0a80-\u0aff]+")
+_LATIN_RUN = re.compile(r"[A-Za-z]+")
+
+
+@lru_cache(maxsize=1024)
 def _count_scripts(text: str) -> ScriptCounts:
-    counts = ScriptCounts()
-    for ch in text:
-        code = ord(ch)
-        if 0x0900 <= code <= 0x097F:
-            counts.devanagari += 1
-        elif 0x0A80 <= code <= 0x0AFF:
-            counts.gujarati += 1
-        elif (0x0041 <= code <= 0x005A) or (0x0061 <= code <= 0x007A):
-            counts.latin += 1
-    return counts
+    # detect_style and transliterate_to_latin count the same normalized text back
+    # to back (once per parsed unit); the second count is a cache hit.
+    if text.isascii():
+        # Roman queries (Hinglish, English) cannot contain Indic code points.
+        return ScriptCounts(latin=len(_NON_LATIN_LETTERS.sub("", text)))
+
+    if np is not None and len(text) >= _VECTOR_COUNT_MIN_LEN:
+        # Code points as one uint32 array: three range tests replace a Python-level
+        # branch per character on long ingest chunks.
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        folded = codes | 0x20
+        return ScriptCounts(
+            devanagari=int(np.count_nonzero((codes >= 0x0900) & (codes <= 0x097F))),
+            gujarati=int(np.count_nonzero((codes >= 0x0A80) & (codes <= 0x0AFF))),
+            latin=int(np.count_nonzero((folded >= 0x61) & (folded <= 0x7A))),
+        )
+
+    # Runs of each script are found by the regex engine in C; only their lengths
+    # are summed in Python.
+    return ScriptCounts(
+        devanagari=sum(map(len, _DEVANAGARI_RUN.findall(text))),
+        gujarati=sum(map(len, _GUJARATI_RUN.findall(text))),
+        latin=sum(map(len, _LATIN_RUN.findall(text))),
+    )
+
+
+_LATIN_WORD = re.compile(r"[a-zA-Z]+")
+_ROMAN_HINTS = tuple(sorted(_HI_HINTS | _GU_HINTS))
 
 
 def _latin_style_guess(text: str) -> StyleTag:
-    words = set(re.findall(r"[a-zA-Z]+", text.lower()))
+    lowered = text.lower()
+    # A hint can only be a whole word if it occurs as a substring. Most chunks
+    # (garbled legacy-font text included) contain none, and a few substring
+    # tests are far cheaper than tokenizing every word.
+    if not any(hint in lowered for hint in _ROMAN_HINTS):
+        return "en"
+    words = set(_LATIN_WORD.findall(lowered))
     hi_score = len(words & _HI_HINTS)
     gu_score = len(words & _GU_HINTS)
 
@@ -78,6 +161,14 @@ def _latin_style_guess(text: str) -> StyleTag:
 
 def detect_style(text: str) -> StyleTag:
     text = normalize_text(text)
+    # Chat turns restyle and re-detect the same short strings (queries, answers,
+    # conversions); long texts skip the cache like normalize_text does.
+    if len(text) > _NORMALIZE_CACHE_MAX_LEN:
+        return _detect_style_normalized(text)
+    return _detect_style_cached(text)
+
+
+def _detect_style_normalized(text: str) -> StyleTag:
     counts = _count_scripts(text)
 
     if counts.devanagari > counts.gujarati and counts.devanagari >= counts.latin:
@@ -89,6 +180,12 @@ def detect_style(text: str) -> StyleTag:
 
 def transliterate_to_latin(text: str) -> str:
     text = normalize_text(text)
+    if len(text) > _NORMALIZE_CACHE_MAX_LEN:
+        return _transliterate_to_latin_normalized(text)
+    return _transliterate_to_latin_cached(text)
+
+
+def _transliterate_to_latin_normalized(text: str) -> str:
     if not text:
         return ""
 
@@ -98,14 +195,29 @@ def transliterate_to_latin(text: str) -> str:
     counts = _count_scripts(text)
     try:
         if counts.devanagari > 0:
-            return transliterate(text, sanscript.DEVANAGARI, sanscript.ITRANS)
+            return _brahmic_to_itrans(text, sanscript.DEVANAGARI)
         if counts.gujarati > 0:
-            return transliterate(text, sanscript.GUJARATI, sanscript.ITRANS)
+            return _brahmic_to_itrans(text, sanscript.GUJARATI)
     except Exception:
         return text
     return text
 
 
+_detect_style_cached = lru_cache(maxsize=4096)(_detect_style_normalized)
+_transliterate_to_latin_cached = lru_cache(maxsize=4096)(_transliterate_to_latin_normalized)
+
+
+def _brahmic_to_itrans(text: str, source: str) -> str:
+    # Brahmic -> Roman output for a word never depends on neighbouring words, so
+    # the (highly repetitive) scripture vocabulary is transliterated once per word.
+    return " ".join([_brahmic_word_to_itrans(word, source) for word in text.split(" ")])
+
+
+@lru_cache(maxsize=65536)
+def _brahmic_word_to_itrans(word: str, source: str) -> str:
+    return transliterate(word, source, sanscript.ITRANS)
+
+
 def transliterate_latin_to_script(text: str, target: StyleTag) -> str:
     """Best-effort conversion for ITRANS-like user text.
 
@@ -113,7 +225,10 @@ def transliterate_latin_to_script(text: str, target: StyleTag) -> str:
     the input is returned unchanged.
     """
 
-    text = normalize_text(text)
+    return _transliterate_latin_to_script_normalized(normalize_text(text), target)
+
+
+def _transliterate_latin_to_script_normalized(text: str, target: StyleTag) -> str:
     if not text or transliterate is None or sanscript is None:
         return text
 
@@ -133,15 +248,15 @@ def query_variants(query: str, style: StyleTag) -> list[str]:
         return []
 
     variants = {normalized, normalized.lower()}
-    latin = transliterate_to_latin(normalized)
+    latin = _transliterate_to_latin_normalized(normalized)
     if latin:
         variants.add(latin)
         variants.add(latin.lower())
 
     if style in {"hi_latn", "en"}:
-        variants.add(transliterate_latin_to_script(normalized, "hi"))
+        variants.add(_transliterate_latin_to_script_normalized(normalized, "hi"))
     if style in {"gu_latn", "en"}:
-        variants.add(transliterate_latin_to_script(normalized, "gu"))
+        variants.add(_transliterate_latin_to_script_normalized(normalized, "gu"))
 
     return [item for item in variants if item]
 
@@ -155,22 +270,25 @@ def resolve_output_style(style_mode: str, detected: StyleTag) -> StyleTag:
 def render_in_style(text: str, style: StyleTag) -> str:
     """Render output in requested style with best-effort transliteration."""
 
-    text = normalize_text(text)
+    return _render_normalized(normalize_text(text), style)
+
+
+def _render_normalized(text: str, style: StyleTag) -> str:
     if not text:
         return ""
 
-    counts = _count_scripts(text)
+    if style in _LATIN_STYLES:
+        return _transliterate_to_latin_normalized(text)
 
-    if style in {"en", "hi_latn", "gu_latn"}:
-        return transliterate_to_latin(text)
+    counts = _count_scripts(text)
     if style == "hi":
         if counts.devanagari >= max(counts.gujarati, counts.latin):
             return text
-        return transliterate_latin_to_script(text, "hi")
+        return _transliterate_latin_to_script_normalized(text, "hi")
     if style == "gu":
         if counts.gujarati >= max(counts.devanagari, counts.latin):
             return text
-        return transliterate_latin_to_script(text, "gu")
+        return _transliterate_latin_to_script_normalized(text, "gu")
     return text
 
 
@@ -179,10 +297,10 @@ def convert_text_fallback(text: str, mode: ConversionMode) -> str:
     if not text:
         return ""
 
-    if mode in {"hi", "gu", "en", "hi_latn", "gu_latn"}:
-        return render_in_style(text, mode if mode in {"hi", "gu", "en", "hi_latn", "gu_latn"} else "en")
+    if mode in _STYLE_TAGS:
+        return _render_normalized(text, mode)
     if mode == "en_deva":
-        return transliterate_latin_to_script(text, "hi")
+        return _transliterate_latin_to_script_normalized(text, "hi")
     if mode == "en_gu":
-        return transliterate_latin_to_script(text, "gu")
+        return _transliterate_latin_to_script_normalized(text, "gu")
     return text
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import re
+import time
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import Any
+from urllib.parse import quote
 
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, Request
 from fastapi import HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, Response, StreamingResponse
+from pydantic_core import to_json
+from starlette.concurrency import run_in_threadpool
 
 from .chat import ChatService
 from .config import Settings, get_settings
@@ -14,6 +27,8 @@ from .fx import FxService
 from .ingestion import IngestionService
 from .language import convert_text_fallback
 from .models import (
+    ChatBatchRequest,
+    ChatBatchResponse,
     ChatRequest,
     ChatResponse,
     ConvertRequest,
@@ -27,16 +42,35 @@ from .models import (
     ThreadCreateResponse,
     SessionRecord,
 )
+from .ocr_cache import OcrCache
 from .openai_client import OpenAIClient
 from .pricing import PricingCatalog
 from .rate_limit import InMemoryRateLimiter
+from .response_cache import ResponseCache, chat_cache_key
 from .retrieval import RetrievalService
 from .vector_store import VectorStore
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
 
-def build_services(
-    settings: Settings,
-) -> tuple[Database, VectorStore, OpenAIClient, IngestionService, ChatService]:
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+
+@dataclass(slots=True)
+class Services:
+    database: Database
+    vectors: VectorStore
+    llm_client: OpenAIClient
+    ingestion_service: IngestionService
+    chat_service: ChatService
+    # Chat turns spend seconds waiting on OpenAI; a dedicated pool keeps them from
+    # exhausting the shared threadpool used by the other sync work.
+    chat_executor: ThreadPoolExecutor
+
+
+def build_services(settings: Settings) -> Services:
     db = Database(settings.db_path)
     db.init_db()
 
@@ -46,6 +80,8 @@ def build_services(
         chat_model=settings.openai_chat_model,
         embedding_model=settings.openai_embedding_model,
         vision_model=settings.openai_vision_model,
+        max_retries=settings.openai_max_retries,
+        ocr_cache=OcrCache(settings.data_dir / "ocr_cache.db"),
     )
 
     ingest = IngestionService(settings=settings, db=db, vectors=vectors, llm=openai)
@@ -65,46 +101,126 @@ def build_services(
         pricing_catalog=pricing_catalog,
         fx_service=fx_service,
     )
-    return db, vectors, openai, ingest, chat
+    return Services(
+        database=db,
+        vectors=vectors,
+        llm_client=openai,
+        ingestion_service=ingest,
+        chat_service=chat,
+        chat_executor=ThreadPoolExecutor(max_workers=max(1, settings.chat_workers), thread_name_prefix="chat"),
+    )
 
 
 settings = get_settings()
-database, vectors, llm_client, ingestion_service, chat_service = build_services(settings)
+API_PREFIX = settings.api_prefix
+WORKSPACE_ROOT = settings.workspace_root.resolve()
 rate_limiter = InMemoryRateLimiter(max_per_minute=settings.request_rate_limit_per_min)
+chat_cache = ResponseCache(
+    max_entries=settings.chat_cache_max_entries,
+    ttl_seconds=settings.chat_cache_ttl_seconds,
+)
+_inflight_chats: dict[bytes, asyncio.Future[tuple[ChatResponse, bytes]]] = {}
+
+
+def _warm_up(services: Services) -> None:
+    services.database.count_units()
+    services.vectors.warmup()
+    # The TLS handshake to OpenAI must not hold up readiness; it runs alongside.
+    services.llm_client.warmup_in_background()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Services are built here rather than at import time, so importing the module
+    # (and forking workers) stays cheap and Chroma loads off the event loop.
+    services = await run_in_threadpool(build_services, settings)
+    app.state.services = services
+    await run_in_threadpool(_warm_up, services)
+    yield
+    services.chat_executor.shutdown(wait=False, cancel_futures=True)
+    services.llm_client.close_pdf_documents()
+
+
+app = FastAPI(
+    title=settings.app_name,
+    lifespan=lifespan,
+    default_response_class=DefaultJSONResponse,
+)
+
+
+def get_services(request: Request) -> Services:
+    return request.app.state.services
 
-app = FastAPI(title=settings.app_name)
 
+class _GZipExceptPdfMiddleware(GZipMiddleware):
+    # PDFs are already compressed and are served via FileResponse/X-Accel-Redirect;
+    # gzipping them would only burn CPU and defeat zero-copy sends.
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(f"{API_PREFIX}/pdf/"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(_GZipExceptPdfMiddleware, minimum_size=1024, compresslevel=5)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    # Explicit origins; the frontend never sends cookies, so credentials stay off.
+    allow_origins=settings.cors_origins,
+    allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
 @app.get("/")
-def root() -> dict[str, str]:
+async def root() -> dict[str, str]:
     return {"name": settings.app_name, "status": "ok"}
 
 
-@app.get(f"{settings.api_prefix}/health", response_model=HealthResponse)
-def health() -> HealthResponse:
-    return HealthResponse(
-        status="ok",
-        db_ready=True,
-        vector_ready=vectors.available,
-        indexed_chunks=database.count_units(),
-        llm_enabled=llm_client.enabled,
-        llm_provider="openai",
-        llm_generation_error=_compact_error(llm_client.last_generation_error),
-        ocr_error=_compact_error(llm_client.last_ocr_error),
+@app.get(f"{API_PREFIX}/health", response_model=HealthResponse)
+async def health(services: Services = Depends(get_services)) -> Response:
+    # Polled by probes; the fixed HealthResponse shape is serialized directly,
+    # skipping model construction and response_model validation.
+    llm_client = services.llm_client
+    return DefaultJSONResponse(
+        {
+            "status": "ok",
+            "db_ready": True,
+            "vector_ready": services.vectors.available,
+            "indexed_chunks": _indexed_chunks(services.database),
+            "llm_enabled": llm_client.enabled,
+            "llm_provider": "openai",
+            "llm_generation_error": _compact_error(llm_client.last_generation_error),
+            "ocr_error": _compact_error(llm_client.last_ocr_error),
+        }
     )
 
 
-@app.post(f"{settings.api_prefix}/ingest", response_model=IngestResponse)
-def ingest() -> IngestResponse:
-    stats = ingestion_service.ingest()
+_INDEXED_CHUNKS_TTL_SECONDS = 5.0
+_indexed_chunks_count = 0
+_indexed_chunks_expires_at = 0.0
+
+
+def _indexed_chunks(database: Database) -> int:
+    global _indexed_chunks_count, _indexed_chunks_expires_at
+    now = time.monotonic()
+    if now >= _indexed_chunks_expires_at:
+        _indexed_chunks_count = database.count_units()
+        _indexed_chunks_expires_at = now + _INDEXED_CHUNKS_TTL_SECONDS
+    return _indexed_chunks_count
+
+
+def _reset_indexed_chunks() -> None:
+    global _indexed_chunks_expires_at
+    _indexed_chunks_expires_at = 0.0
+
+
+@app.post(f"{API_PREFIX}/ingest", response_model=IngestResponse)
+async def ingest(services: Services = Depends(get_services)) -> IngestResponse:
+    stats = await run_in_threadpool(services.ingestion_service.ingest)
+    chat_cache.clear()
+    _reset_indexed_chunks()
     return IngestResponse(
         files_processed=stats.files_processed,
         chunks_created=stats.chunks_created,
@@ -114,102 +230,263 @@ def ingest() -> IngestResponse:
     )
 
 
-@app.get(f"{settings.api_prefix}/filters", response_model=FiltersResponse)
-def filters() -> FiltersResponse:
-    granths, prakrans = database.list_filters()
+@app.get(f"{API_PREFIX}/filters", response_model=FiltersResponse)
+async def filters(services: Services = Depends(get_services)) -> FiltersResponse:
+    granths, prakrans = await run_in_threadpool(services.database.list_filters)
     return FiltersResponse(granths=granths, prakrans=prakrans)
 
 
-@app.get(f"{settings.api_prefix}/history/{{session_id}}", response_model=list[MessageRecord])
-def history(session_id: str) -> list[MessageRecord]:
-    rows = database.get_session_messages(session_id)
-    return [MessageRecord(**row) for row in rows]
+@app.get(f"{API_PREFIX}/history/{{session_id}}", response_model=list[MessageRecord])
+async def history(session_id: str, services: Services = Depends(get_services)) -> list[dict]:
+    # Rows are validated once, as a list, against response_model.
+    return await run_in_threadpool(services.database.get_session_messages, session_id)
 
 
-@app.get(f"{settings.api_prefix}/sessions", response_model=list[SessionRecord])
-def sessions(limit: int = 50, include_archived: bool = False) -> list[SessionRecord]:
-    rows = database.list_threads(limit=limit, include_archived=include_archived)
-    return [
-        SessionRecord(
-            session_id=row["session_id"],
-            title=(row.get("title_text") or "New chat")[:120],
-            preview=(row.get("preview_text") or "")[:240],
-            last_message_at=row["last_message_at"],
-            message_count=int(row.get("message_count", 0)),
-        )
-        for row in rows
-    ]
+@app.get(f"{API_PREFIX}/sessions", response_model=list[SessionRecord])
+async def sessions(
+    limit: int = 50,
+    include_archived: bool = False,
+    services: Services = Depends(get_services),
+) -> list[dict]:
+    rows = await run_in_threadpool(services.database.list_threads, limit=limit, include_archived=include_archived)
+    return _session_rows(rows)
 
 
-@app.get(f"{settings.api_prefix}/threads", response_model=list[SessionRecord])
-def threads(limit: int = 50, include_archived: bool = False) -> list[SessionRecord]:
-    rows = database.list_threads(limit=limit, include_archived=include_archived)
+@app.get(f"{API_PREFIX}/threads", response_model=list[SessionRecord])
+async def threads(
+    limit: int = 50,
+    include_archived: bool = False,
+    services: Services = Depends(get_services),
+) -> list[dict]:
+    rows = await run_in_threadpool(services.database.list_threads, limit=limit, include_archived=include_archived)
+    return _session_rows(rows)
+
+
+def _session_rows(rows: list[dict]) -> list[dict]:
+    # Plain dicts shaped like SessionRecord; response_model validates the list in one pass.
     return [
-        SessionRecord(
-            session_id=row["session_id"],
-            title=(row.get("title_text") or "New chat")[:120],
-            preview=(row.get("preview_text") or "")[:240],
-            last_message_at=row["last_message_at"],
-            message_count=int(row.get("message_count", 0)),
-        )
+        {
+            "session_id": row["session_id"],
+            "title": (row.get("title_text") or "New chat")[:120],
+            "preview": (row.get("preview_text") or "")[:240],
+            "last_message_at": row["last_message_at"],
+            "message_count": int(row.get("message_count", 0)),
+        }
         for row in rows
     ]
 
 
-@app.post(f"{settings.api_prefix}/threads", response_model=ThreadCreateResponse)
-def create_thread(payload: ThreadCreateRequest | None = None) -> ThreadCreateResponse:
-    session_id = database.create_thread(title=(payload.title if payload else None))
+@app.post(f"{API_PREFIX}/threads", response_model=ThreadCreateResponse)
+async def create_thread(
+    payload: ThreadCreateRequest | None = None,
+    services: Services = Depends(get_services),
+) -> ThreadCreateResponse:
+    session_id = await run_in_threadpool(services.database.create_thread, title=(payload.title if payload else None))
     return ThreadCreateResponse(session_id=session_id)
 
 
 @app.post(
-    f"{settings.api_prefix}/chat",
+    f"{API_PREFIX}/chat",
     response_model=ChatResponse,
     dependencies=[Depends(rate_limiter.dependency())],
 )
-def chat(payload: ChatRequest) -> ChatResponse:
-    return chat_service.respond(payload)
+async def chat(payload: ChatRequest, services: Services = Depends(get_services)) -> Response:
+    # Serves immediate repeats (retries, refreshes) of the same message in a session.
+    cache_key = chat_cache_key(payload)
+    cached = chat_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    # Returned pre-serialized: the response was built and validated by ChatService,
+    # so FastAPI's response_model re-validation would be pure overhead.
+    _, body = await _respond_and_cache(services, payload, cache_key)
+    return Response(content=body, media_type="application/json")
+
+
+@app.post(f"{API_PREFIX}/chat/batch", response_model=ChatBatchResponse)
+async def chat_batch(
+    payload: ChatBatchRequest,
+    request: Request,
+    services: Services = Depends(get_services),
+) -> ChatBatchResponse:
+    # Every item runs a full chat pipeline, so each one costs a rate-limit slot.
+    rate_limiter.check(request, cost=len(payload.items))
+    # Turns of one session depend on each other's memory, so they run in order;
+    # different sessions run concurrently on the chat executor.
+    by_session: dict[str, list[int]] = {}
+    for index, item in enumerate(payload.items):
+        by_session.setdefault(item.session_id, []).append(index)
+
+    results: list[ChatResponse | None] = [None] * len(payload.items)
+
+    async def run_session(indexes: list[int]) -> None:
+        for index in indexes:
+            item = payload.items[index]
+            cache_key = chat_cache_key(item)
+            cached = chat_cache.get(cache_key)
+            if cached is not None:
+                results[index] = ChatResponse.model_validate_json(cached)
+            else:
+                results[index], _ = await _respond_and_cache(services, item, cache_key)
+
+    await asyncio.gather(*(run_session(indexes) for indexes in by_session.values()))
+    return ChatBatchResponse(items=results)
+
+
+async def _respond_and_cache(
+    services: Services,
+    payload: ChatRequest,
+    cache_key: bytes,
+) -> tuple[ChatResponse, bytes]:
+    # Shielded so one client disconnecting does not cancel the turn for the others.
+    return await asyncio.shield(_start_chat(services, payload, cache_key))
+
+
+def _start_chat(
+    services: Services,
+    payload: ChatRequest,
+    cache_key: bytes,
+    on_progress: Callable[[str, Any], None] | None = None,
+) -> asyncio.Future[tuple[ChatResponse, bytes]]:
+    # Singleflight: identical requests that arrive while one is still running share
+    # its result instead of starting another LLM pipeline (and persisting a duplicate
+    # turn). A request that joins a running turn gets no progress events.
+    task = _inflight_chats.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(_respond_uncached(services, payload, cache_key, on_progress))
+        _inflight_chats[cache_key] = task
+        task.add_done_callback(lambda _: _inflight_chats.pop(cache_key, None))
+    return task
+
+
+async def _respond_uncached(
+    services: Services,
+    payload: ChatRequest,
+    cache_key: bytes,
+    on_progress: Callable[[str, Any], None] | None = None,
+) -> tuple[ChatResponse, bytes]:
+    response = await asyncio.get_running_loop().run_in_executor(
+        services.chat_executor, partial(services.chat_service.respond, payload, on_progress=on_progress)
+    )
+    # Runs in the task, not in a request handler, so the cache is updated even if
+    # every client disconnected while the turn was running.
+    return response, _remember_chat_response(payload, cache_key, response)
+
+
+def _remember_chat_response(payload: ChatRequest, cache_key: bytes, response: ChatResponse) -> bytes:
+    body = to_json(response)
+    # Any fresh turn changes session memory/context, so earlier entries are stale.
+    chat_cache.invalidate_group(payload.session_id)
+    if not response.not_found:
+        chat_cache.put(cache_key, body, group=payload.session_id)
+    return body
+
+
+@app.post(
+    f"{API_PREFIX}/chat/stream",
+    dependencies=[Depends(rate_limiter.dependency())],
+)
+async def chat_stream(payload: ChatRequest, services: Services = Depends(get_services)) -> StreamingResponse:
+    # Server-sent events: "citations" as soon as retrieval settles (before the LLM
+    # writes the answer), then "final" carrying the full ChatResponse.
+    return StreamingResponse(
+        _chat_events(services, payload),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _chat_events(services: Services, payload: ChatRequest) -> AsyncIterator[bytes]:
+    cache_key = chat_cache_key(payload)
+    cached = chat_cache.get(cache_key)
+    if cached is not None:
+        yield _sse("final", cached)
+        return
+
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue[tuple[str, Any] | None] = asyncio.Queue()
+
+    def on_progress(event: str, data: Any) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    # Shares the singleflight with /chat, so a concurrent identical request does not
+    # run (and persist) the turn twice.
+    task = _start_chat(services, payload, cache_key, on_progress)
+    # Completion is delivered through the loop after every queued progress event.
+    task.add_done_callback(lambda _: events.put_nowait(None))
+    while (item := await events.get()) is not None:
+        event, data = item
+        yield _sse(event, to_json(data))
+
+    try:
+        _, body = task.result()
+    except Exception:
+        yield _sse("error", b'{"detail":"Chat failed"}')
+        return
+    yield _sse("final", body)
+
+
+def _sse(event: str, data: bytes) -> bytes:
+    return b"event: " + event.encode("ascii") + b"\ndata: " + data + b"\n\n"
 
 
 @app.post(
-    f"{settings.api_prefix}/convert",
+    f"{API_PREFIX}/convert",
     response_model=ConvertResponse,
     dependencies=[Depends(rate_limiter.dependency())],
 )
-def convert(payload: ConvertRequest) -> ConvertResponse:
-    if llm_client.enabled:
-        text = llm_client.convert_text(payload.text, payload.target_mode)
-        if text.strip() == payload.text.strip():
-            text = convert_text_fallback(payload.text, payload.target_mode)
-    else:
-        text = convert_text_fallback(payload.text, payload.target_mode)
+async def convert(payload: ConvertRequest, services: Services = Depends(get_services)) -> ConvertResponse:
+    text = await run_in_threadpool(_convert_text, services.llm_client, payload.text, payload.target_mode)
     return ConvertResponse(text=text, target_mode=payload.target_mode)
 
 
-@app.get(f"{settings.api_prefix}/pdf/{{citation_id}}")
-def citation_pdf(citation_id: str) -> FileResponse:
-    unit = database.get_unit_by_id(citation_id)
+def _convert_text(llm_client: OpenAIClient, text: str, target_mode: str) -> str:
+    if llm_client.enabled:
+        converted = llm_client.convert_text(text, target_mode)
+        if converted.strip() == text.strip():
+            converted = convert_text_fallback(text, target_mode)
+        return converted
+    return convert_text_fallback(text, target_mode)
+
+
+@app.get(f"{API_PREFIX}/pdf/{{citation_id}}")
+async def citation_pdf(citation_id: str, services: Services = Depends(get_services)) -> Response:
+    unit = await run_in_threadpool(services.database.get_unit_by_id, citation_id)
     if unit is None:
         raise HTTPException(status_code=404, detail="Citation not found")
 
-    pdf_path = Path(unit.pdf_path).resolve()
-    workspace_root = settings.workspace_root.resolve()
-    if workspace_root not in pdf_path.parents and pdf_path != workspace_root:
-        raise HTTPException(status_code=403, detail="PDF path is outside workspace")
-    if not pdf_path.exists() or not pdf_path.is_file():
+    pdf_path = _validated_pdf_path(unit.pdf_path)
+    if not pdf_path.is_file():
         raise HTTPException(status_code=404, detail="PDF file missing on disk")
 
+    headers = {"Content-Disposition": f'inline; filename="{pdf_path.name}"'}
+    if settings.pdf_accel_redirect_prefix:
+        # Behind nginx: hand the transfer to the proxy (internal location) so the
+        # worker never reads the PDF bytes.
+        relative = pdf_path.relative_to(WORKSPACE_ROOT).as_posix()
+        headers["X-Accel-Redirect"] = settings.pdf_accel_redirect_prefix.rstrip("/") + "/" + quote(relative)
+        return Response(media_type="application/pdf", headers=headers)
+
     return FileResponse(
         str(pdf_path),
         media_type="application/pdf",
         filename=pdf_path.name,
-        headers={"Content-Disposition": f'inline; filename="{pdf_path.name}"'},
+        headers=headers,
     )
 
 
-@app.get(f"{settings.api_prefix}/costs/{{session_id}}", response_model=SessionCostResponse)
-def session_costs(session_id: str) -> SessionCostResponse:
-    payload = database.get_session_costs(session_id)
+@lru_cache(maxsize=4096)
+def _validated_pdf_path(pdf_path: str) -> Path:
+    # Stored paths are immutable per unit, so resolve + containment is done once.
+    # Existence is still checked per request by the caller.
+    resolved = Path(pdf_path).resolve()
+    if WORKSPACE_ROOT not in resolved.parents and resolved != WORKSPACE_ROOT:
+        raise HTTPException(status_code=403, detail="PDF path is outside workspace")
+    return resolved
+
+
+@app.get(f"{API_PREFIX}/costs/{{session_id}}", response_model=SessionCostResponse)
+async def session_costs(session_id: str, services: Services = Depends(get_services)) -> SessionCostResponse:
+    payload = await run_in_threadpool(services.database.get_session_costs, session_id)
     return SessionCostResponse(
         session_id=payload["session_id"],
         turns=int(payload["turns"]),
@@ -222,17 +499,24 @@ def session_costs(session_id: str) -> SessionCostResponse:
     )
 
 
+# Checked in order: the first category that matches anywhere in the text wins.
+_ERROR_CATEGORIES: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"quota exceeded|rate limit", re.IGNORECASE), "OpenAI quota/rate-limit reached."),
+    (
+        re.compile(r"nodename nor servname provided|name resolution", re.IGNORECASE),
+        "Network/DNS issue while contacting OpenAI.",
+    ),
+    (re.compile(r"api key|permission|unauthorized", re.IGNORECASE), "OpenAI authentication/permissions issue."),
+)
+
+
 def _compact_error(value: str | None) -> str | None:
     if not value:
         return None
     text = value.strip()
     if not text:
         return None
-    lowered = text.lower()
-    if "quota exceeded" in lowered or "rate limit" in lowered:
-        return "OpenAI quota/rate-limit reached."
-    if "nodename nor servname provided" in lowered or "name resolution" in lowered:
-        return "Network/DNS issue while contacting OpenAI."
-    if "api key" in lowered or "permission" in lowered or "unauthorized" in lowered:
-        return "OpenAI authentication/permissions issue."
+    for pattern, message in _ERROR_CATEGORIES:
+        if pattern.search(text):
+            return message
     return text[:180]
@@ -23,6 +23,10 @@ class ChatRequest(BaseModel):
     top_k: int | None = Field(default=None, ge=1, le=12)
 
 
+class ChatBatchRequest(BaseModel):
+    items: list[ChatRequest] = Field(min_length=1, max_length=8)
+
+
 class Citation(BaseModel):
     citation_id: str
     granth_name: str
@@ -78,6 +82,10 @@ class ChatResponse(BaseModel):
     debug: dict | None = None
 
 
+class ChatBatchResponse(BaseModel):
+    items: list[ChatResponse]
+
+
 class ConvertRequest(BaseModel):
     text: str = Field(min_length=1, max_length=12_000)
     target_mode: ConvertMode
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class OcrCache:
+    """Persistent page-OCR results keyed by a digest of the rendered page image.
+
+    Keying on the image (not path/page) means edited or replaced PDFs miss the
+    cache instead of returning stale text.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ocr_pages (
+                    image_key TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get(self, image_key: str) -> str | None:
+        with self.connect() as conn:
+            row = conn.execute("SELECT text FROM ocr_pages WHERE image_key = ?", (image_key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, image_key: str, text: str) -> None:
+        with self.connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ocr_pages (image_key, text) VALUES (?, ?)",
+                (image_key, text),
+            )
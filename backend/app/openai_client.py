@@ -1,32 +1,262 @@
 from __future__ import annotations
 
+import atexit
 import base64
 import hashlib
 import json
 import math
+import re
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Iterable
 
 from .db import RetrievedUnit
+from .ocr_cache import OcrCache
 from .pricing import UsageCollector
 from .text_quality import is_garbled_text
 
 try:
-    from openai import OpenAI
+    import httpx
+    from openai import DefaultHttpxClient, OpenAI
 except Exception:  # pragma: no cover - optional dependency
     OpenAI = None  # type: ignore[misc]
 
+try:
+    import h2  # noqa: F401  # enables HTTP/2 on the shared pool
+except Exception:  # pragma: no cover - optional dependency
+    h2 = None
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import simdjson
+except Exception:  # pragma: no cover - optional dependency
+    simdjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+# simdjson parsers reuse their buffers but are not thread-safe: one per thread.
+_simdjson_local = threading.local()
+
+_EMBED_MAX_CONCURRENCY = 4
+_JPEG_TRY_ABOVE_BYTES = 1024 * 1024
+_MAX_OPEN_PDF_DOCUMENTS = 4
+_COMPLETION_CACHE_MAX_TEMPERATURE = 0.1
+# Latin, Devanagari and Gujarati word runs (ZWJ/ZWNJ kept inside conjuncts);
+# punctuation such as danda or quotes never sticks to a token.
+_HASH_TOKEN_RE = re.compile(r"[0-9a-z\u0900-\u0963\u0966-\u097f\u0a80-\u0aff\u200c\u200d]+")
+
 
 def _hash_embedding(text: str, dim: int = 1536) -> list[float]:
+    # The vector depends only on the lowercased token sequence, so that is the key.
+    return list(_hash_embedding_cached(" ".join(_HASH_TOKEN_RE.findall(text.lower())), dim))
+
+
+# Vectors are kept as packed doubles (12 KB at dim 1536, not ~50 KB of boxed
+# floats), and only for a few hundred texts: the cache is for repeated queries,
+# while ingest texts are seen once.
+@lru_cache(maxsize=512)
+def _hash_embedding_cached(text: str, dim: int) -> array[float]:
+    # Scripture text repeats vocabulary heavily: each distinct token is hashed once
+    # and its contribution weighted by how often it occurs.
+    counts = Counter(text.split())
+    if np is not None and counts:
+        return _hash_embedding_numpy(counts, dim)
+
     vector = [0.0] * dim
-    for token in text.lower().split():
-        digest = hashlib.sha256(token.encode("utf-8")).digest()
+    for token, count in counts.items():
+        digest = _token_digest(token)
         for i in range(0, min(len(digest), dim), 2):
             idx = digest[i] % dim
-            vector[idx] += (digest[i + 1] / 255.0) - 0.5
+            vector[idx] += count * ((digest[i + 1] / 255.0) - 0.5)
+
+    norm = _safe_norm(math.hypot(*vector))
+    return array("d", [v / norm for v in vector])
+
+
+def _hash_embedding_numpy(counts: Counter[str], dim: int) -> array[float]:
+    # Same (index byte, value byte) pairs as the loop above, scattered into the
+    # vector in one bincount call.
+    pairs = (min(hashlib.sha256().digest_size, dim) + 1) // 2
+    digests = b"".join(map(_token_digest, counts))
+    table = np.frombuffer(digests, dtype=np.uint8).reshape(len(counts), -1)
+    weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    indexes = table[:, 0 : 2 * pairs : 2].ravel().astype(np.intp) % dim
+    values = ((table[:, 1 : 2 * pairs : 2] / 255.0 - 0.5) * weights[:, None]).ravel()
+    vector = np.bincount(indexes, weights=values, minlength=dim)
+    norm = _safe_norm(float(np.linalg.norm(vector)))
+    return array("d", (vector / norm).astype(np.float64).tobytes())
+
+
+def _safe_norm(norm: float) -> float:
+    # A zero or non-finite norm leaves the vector unscaled instead of spreading NaN.
+    return norm if norm and math.isfinite(norm) else 1.0
+
+
+@lru_cache(maxsize=100_000)
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
 
-    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
-    return [v / norm for v in vector]
+
+# Static prompt scaffolding is built once; per call only the dynamic fields are
+# formatted in. Provider-side prompt caching matches on the prompt prefix, so the
+# invariant instructions come first and every per-turn field (style included)
+# follows.
+_GROUNDED_PROMPT_PREFIX = (
+    "You are a respectful scripture assistant for Tartam texts.\n"
+    "Strict rule: answer using ONLY the provided citations. Do not invent any scripture facts.\n"
+    "If evidence is weak or missing, reply exactly: "
+    "\"I could not find this clearly in available texts.\" and ask one clarifying question.\n"
+    "Reasoning task: solve user intent by synthesizing evidence across citations, not by copy-pasting.\n"
+    "Output format (must follow):\n"
+    "1) Direct Answer: 2-3 lines answering user's intent clearly.\n"
+    "2) Explanation from Chopai: 3-6 lines interpreting the meaning in simple language.\n"
+    "3) Grounding: one line listing source labels (Granth | Prakran | p.#).\n"
+    "Do not output bracket-only indices like [1] or [2].\n"
+    "Keep the tone devotional and practical, not overly academic.\n\n"
+)
+_GROUNDED_PROMPT_TEMPLATE = _GROUNDED_PROMPT_PREFIX + (
+    "Respond in this style/language mode: {target_style}.\n\n"
+    "Planned intent: {intent}\n"
+    "Required facts to verify:\n{required_facts}\n\n"
+    "User reference constraints:\n{constraints}\n\n"
+    "Deterministic facts:\n{deterministic_facts}\n\n"
+    "Session memory summary:\n{memory_summary}\n\n"
+    "Session key facts:\n{key_facts}\n\n"
+    "Recent Chat Context:\n{history}\n\n"
+    "User Question:\n{question}\n\n"
+    "Citations:\n{citations}\n"
+)
+
+
+@lru_cache(maxsize=1024)
+def _citation_block(idx: int, granth: str, prakran: str, chopai_lines: tuple[str, ...], meaning: str) -> str:
+    # Follow-up turns usually re-cite the same units at the same slots. The block is
+    # assembled from one flat list of pieces in a single join.
+    prefix = f"[{idx}] "
+    return "".join(
+        (
+            prefix, "Granth: ", granth, "\n",
+            prefix, "Prakran: ", prakran, "\n",
+            prefix, "Chopai: ", " | ".join(chopai_lines), "\n",
+            prefix, "Meaning: ", meaning,
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def _shared_openai(api_key: str, max_retries: int) -> Any:
+    # One SDK client (and keep-alive pool) per key for the whole process, however
+    # many OpenAIClient wrappers get built.
+    http_client = DefaultHttpxClient(
+        http2=h2 is not None,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    )
+    atexit.register(http_client.close)
+    return OpenAI(api_key=api_key, max_retries=max_retries, http_client=http_client)
+
+
+def _loads_json_object(text: str) -> Any:
+    if simdjson is not None:
+        parser = getattr(_simdjson_local, "parser", None)
+        if parser is None:
+            parser = _simdjson_local.parser = simdjson.Parser()
+        try:
+            parsed = parser.parse(text.encode("utf-8"))
+        except Exception:
+            pass  # e.g. integers beyond 64 bits; let the general parser decide
+        else:
+            # Proxies are invalidated by the next parse; materialize before returning.
+            return parsed.as_dict() if isinstance(parsed, simdjson.Object) else None
+    return _json_loads(text)
+
+
+_OPTIONAL_RESPONSE_PARAMS = ("temperature", "prompt_cache_key")
+
+
+def _rejected_optional_params(exc: Exception, kwargs: dict[str, Any]) -> list[str]:
+    message = str(exc).lower()
+    sent = [key for key in _OPTIONAL_RESPONSE_PARAMS if key in kwargs]
+    if not sent or not ("unsupported" in message or "unknown parameter" in message or "not allowed" in message):
+        return []
+    # Only the parameter the error names is dropped; reasoning models reject
+    # temperature but still honour prompt_cache_key. An error naming neither drops
+    # one at a time, temperature first.
+    return [key for key in sent if key in message] or sent[:1]
+
+
+def _lenient_json_loads(text: str) -> Any:
+    try:
+        import json5  # imported lazily: only malformed replies reach this
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    try:
+        return json5.loads(text)
+    except Exception:
+        return None
+
+
+def _balanced_object_end(text: str, start: int) -> int:
+    """Index of the brace closing the object opened at ``start``, or -1."""
+
+    depth = 0
+    in_string = False
+    escape = False
+    for index in range(start, len(text)):
+        ch = text[index]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return index
+    return -1
+
+
+class _LRUCache:
+    """Small thread-safe LRU map; keeps long-running servers from growing without bound."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Any, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> str | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Any, value: str) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
 
 
 class OpenAIClient:
@@ -36,6 +266,8 @@ class OpenAIClient:
         chat_model: str,
         embedding_model: str,
         vision_model: str,
+        max_retries: int = 3,
+        ocr_cache: OcrCache | None = None,
     ):
         self.api_key = api_key
         self.chat_model = chat_model
@@ -47,12 +279,24 @@ class OpenAIClient:
         self.last_embedding_error: str | None = None
         self.last_ocr_error: str | None = None
         self._embedding_dim: int = 1536
-        self._page_ocr_cache: dict[str, str] = {}
-        self._legacy_decode_cache: dict[str, str] = {}
+        self._page_ocr_cache = _LRUCache(maxsize=1024)
+        self._ocr_cache = ocr_cache
+        # Open PyMuPDF documents by path, with the mtime they were opened at. PyMuPDF
+        # documents are not thread-safe, so all access goes through the lock.
+        self._pdf_documents: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._pdf_lock = threading.Lock()
+        self._legacy_decode_cache = _LRUCache(maxsize=8192)
+        self._completion_cache = _LRUCache(maxsize=4096)
+        # Per optional request parameter, the models that rejected it once; later
+        # calls leave it out instead of paying a failed round-trip every time.
+        self._rejected_params: dict[str, set[str]] = {key: set() for key in _OPTIONAL_RESPONSE_PARAMS}
 
         if api_key and OpenAI:
             try:
-                self.client = OpenAI(api_key=api_key)
+                # The SDK retries only transient failures (429, timeouts, connection
+                # errors, 5xx) with jittered exponential backoff and honours Retry-After;
+                # anything else still surfaces immediately and hits our fallbacks.
+                self.client = _shared_openai(api_key, max(0, max_retries))
             except Exception:
                 self.client = None
 
@@ -62,6 +306,21 @@ class OpenAIClient:
     def provider(self) -> str:
         return "openai"
 
+    def warmup(self) -> None:
+        # Resolves DNS and opens the pooled TLS connection ahead of the first request.
+        if not self.enabled or self.client is None:
+            return
+        try:
+            self.client.with_options(timeout=5.0, max_retries=0).models.retrieve(self.chat_model)
+        except Exception:
+            pass
+
+    def warmup_in_background(self) -> None:
+        # Callers that should not wait for the handshake (app startup, scripts) let
+        # it finish while they do their own setup.
+        if self.enabled:
+            threading.Thread(target=self.warmup, name="openai-warmup", daemon=True).start()
+
     def embed(
         self,
         text: str,
@@ -114,38 +373,66 @@ class OpenAIClient:
         if not self.enabled or self.client is None:
             return [_hash_embedding(item or "empty", dim=self._embedding_dim) for item in values]
 
-        vectors: list[list[float]] = []
+        # Repeated texts (refrains, boilerplate) are embedded once and scattered back.
+        unique = list(dict.fromkeys(values))
         batch_size = 64
-        for start in range(0, len(values), batch_size):
-            batch = values[start : start + batch_size]
-            try:
-                response = self.client.embeddings.create(model=self.embedding_model, input=batch)
-                data = getattr(response, "data", None) or []
-                if len(data) != len(batch):
-                    raise ValueError("Embedding batch size mismatch")
-
-                sorted_data = sorted(data, key=lambda item: int(getattr(item, "index", 0)))
-                for idx, item in enumerate(sorted_data):
-                    vector = [float(v) for v in (getattr(item, "embedding", None) or [])]
-                    if not vector:
-                        raise ValueError(f"Empty embedding in batch at index {idx}")
-                    self._embedding_dim = len(vector)
-                    vectors.append(vector)
-                usage = self._embedding_usage(response)
-                if usage_collector and usage["input_tokens"] > 0:
+        batches = [unique[start : start + batch_size] for start in range(0, len(unique), batch_size)]
+        # Batches are independent HTTP round-trips, so they overlap on a small pool;
+        # results are consumed in submission order to keep the output aligned.
+        with ThreadPoolExecutor(
+            max_workers=min(_EMBED_MAX_CONCURRENCY, len(batches)),
+            thread_name_prefix="embed",
+        ) as pool:
+            futures = [pool.submit(self._embed_batch, batch) for batch in batches]
+
+            vectors: list[list[float]] = []
+            for batch, future in zip(batches, futures):
+                try:
+                    batch_vectors, input_tokens = future.result()
+                except Exception as exc:
+                    self.last_embedding_error = f"{type(exc).__name__}: {exc}"
+                    vectors.extend(_hash_embedding(item or "empty", dim=self._embedding_dim) for item in batch)
+                    continue
+
+                self._embedding_dim = len(batch_vectors[-1])
+                vectors.extend(batch_vectors)
+                if usage_collector and input_tokens > 0:
                     usage_collector.add(
                         stage=usage_stage,
                         provider=self.provider,
                         model=self.embedding_model,
                         endpoint="embeddings",
-                        input_tokens=usage["input_tokens"],
+                        input_tokens=input_tokens,
                     )
                 self.last_embedding_error = None
-            except Exception as exc:
-                self.last_embedding_error = f"{type(exc).__name__}: {exc}"
-                vectors.extend(_hash_embedding(item or "empty", dim=self._embedding_dim) for item in batch)
 
-        return vectors
+        if len(unique) == len(values):
+            return vectors
+        positions = {text: idx for idx, text in enumerate(unique)}
+        return [vectors[positions[text]] for text in values]
+
+    def _embed_batch(self, batch: list[str]) -> tuple[list[list[float]], int]:
+        response = self.client.embeddings.create(model=self.embedding_model, input=batch)
+        data = getattr(response, "data", None) or []
+        if len(data) != len(batch):
+            raise ValueError("Embedding batch size mismatch")
+
+        # Place each vector at its reported index in one pass instead of sorting.
+        slots: list[Any] = [None] * len(batch)
+        for position, item in enumerate(data):
+            idx = int(getattr(item, "index", position))
+            if not 0 <= idx < len(slots) or slots[idx] is not None:
+                raise ValueError(f"Invalid embedding index {idx} in batch")
+            embedding = getattr(item, "embedding", None)
+            if not embedding:
+                raise ValueError(f"Empty embedding in batch at index {idx}")
+            slots[idx] = embedding
+
+        input_tokens = self._embedding_usage(response)["input_tokens"]
+        if np is not None:
+            # One C-level float conversion for the whole batch; ragged rows raise.
+            return np.asarray(slots, dtype=np.float64).tolist(), input_tokens
+        return [[float(v) for v in embedding] for embedding in slots], input_tokens
 
     def plan_query(
         self,
@@ -230,16 +517,13 @@ class OpenAIClient:
             context_constraints=context_constraints or {},
             grounded_facts=grounded_facts or [],
         )
-        try:
-            text = self._complete(
-                prompt,
-                temperature=0.2,
-                usage_collector=usage_collector,
-                usage_stage="generate_answer",
-            ).strip()
-            return text or "I could not find this clearly in available texts."
-        except Exception:
-            return "I could not find this clearly in available texts."
+        return self._complete_or_default(
+            prompt,
+            "I could not find this clearly in available texts.",
+            temperature=0.2,
+            usage_collector=usage_collector,
+            usage_stage="generate_answer",
+        )
 
     def convert_text(
         self,
@@ -268,16 +552,13 @@ class OpenAIClient:
             f"Target mode: {target_mode}\n\n"
             f"Text:\n{value}"
         )
-        try:
-            converted = self._complete(
-                prompt,
-                temperature=0.1,
-                usage_collector=usage_collector,
-                usage_stage="convert_answer",
-            ).strip()
-            return converted or value
-        except Exception:
-            return value
+        return self._complete_or_default(
+            prompt,
+            value,
+            temperature=0.1,
+            usage_collector=usage_collector,
+            usage_stage="convert_answer",
+        )
 
     def summarize_memory(
         self,
@@ -350,7 +631,8 @@ class OpenAIClient:
         if not self.enabled:
             return value
 
-        key = hashlib.sha256(value.encode("utf-8", errors="ignore")).hexdigest()
+        # Non-cryptographic use: a short BLAKE2b digest keeps keys small for long texts.
+        key = hashlib.blake2b(value.encode("utf-8", errors="ignore"), digest_size=16).digest()
         cached = self._legacy_decode_cache.get(key)
         if cached is not None:
             return cached
@@ -362,16 +644,11 @@ class OpenAIClient:
             "Preserve numbering and line breaks. Output only corrected text.\n\n"
             f"Text:\n{value}"
         )
-        try:
-            recovered = self._complete(prompt, temperature=0.0).strip()
-            if not recovered or recovered == value or is_garbled_text(recovered, threshold=0.03):
-                self._legacy_decode_cache[key] = value
-                return value
-            self._legacy_decode_cache[key] = recovered
-            return recovered
-        except Exception:
-            self._legacy_decode_cache[key] = value
-            return value
+        recovered = self._complete_or_default(prompt, value, temperature=0.0)
+        if is_garbled_text(recovered, threshold=0.03):
+            recovered = value
+        self._legacy_decode_cache.put(key, recovered)
+        return recovered
 
     def ocr_pdf_page(
         self,
@@ -384,13 +661,23 @@ class OpenAIClient:
             return ""
 
         cache_key = f"{pdf_path}:{page_number}"
-        if cache_key in self._page_ocr_cache:
-            return self._page_ocr_cache[cache_key]
+        cached = self._page_ocr_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
-            image_b64 = self._pdf_page_to_base64_png(pdf_path=pdf_path, page_number=page_number)
-            if not image_b64:
+            image_url = self._pdf_page_to_data_url(pdf_path=pdf_path, page_number=page_number)
+            if not image_url:
                 return ""
+            image_key = hashlib.blake2b(
+                f"{self.vision_model}\0{image_url}".encode("ascii"),
+                digest_size=16,
+            ).hexdigest()
+            if self._ocr_cache is not None:
+                stored = self._ocr_cache.get(image_key)
+                if stored is not None:
+                    self._page_ocr_cache.put(cache_key, stored)
+                    return stored
             prompt = (
                 "Extract all readable text from this scripture PDF page exactly as visible. "
                 "Keep original line breaks and script. "
@@ -401,7 +688,7 @@ class OpenAIClient:
                     "role": "user",
                     "content": [
                         {"type": "input_text", "text": prompt},
-                        {"type": "input_image", "image_url": f"data:image/png;base64,{image_b64}"},
+                        {"type": "input_image", "image_url": image_url},
                     ],
                 }
             ]
@@ -412,30 +699,69 @@ class OpenAIClient:
                 usage_collector=usage_collector,
                 usage_stage="ocr_recovery",
             ).strip()
-            self._page_ocr_cache[cache_key] = extracted
+            self._page_ocr_cache.put(cache_key, extracted)
+            if self._ocr_cache is not None and extracted:
+                self._ocr_cache.put(image_key, extracted)
             self.last_ocr_error = None
             return extracted
         except Exception as exc:
             self.last_ocr_error = f"{type(exc).__name__}: {exc}"
             return ""
 
-    def _pdf_page_to_base64_png(self, pdf_path: str, page_number: int) -> str:
+    def _pdf_page_to_data_url(self, pdf_path: str, page_number: int) -> str:
         try:
             import fitz  # type: ignore
         except Exception as exc:  # pragma: no cover - dependency import
             raise RuntimeError("pymupdf is required for OpenAI OCR page rendering") from exc
 
-        document = fitz.open(str(Path(pdf_path)))
-        try:
+        with self._pdf_lock:
+            document = self._open_pdf_document(fitz, pdf_path)
             page_idx = max(0, int(page_number) - 1)
             page = document.load_page(page_idx)
-            pix = page.get_pixmap(dpi=260)
-            image_bytes = pix.tobytes("png")
-        finally:
-            document.close()
+            # Grayscale is all OCR needs: a third of the RGB pixmap's memory and a
+            # markedly smaller, faster-to-encode image.
+            pix = page.get_pixmap(dpi=260, colorspace=fitz.csGRAY)
+            # Clean text pages are smaller (and faster) as PNG than as JPEG; only large
+            # renders, i.e. photographic scans, are worth trying as JPEG.
+            mime, image_bytes = "image/png", pix.tobytes("png")
+            if len(image_bytes) > _JPEG_TRY_ABOVE_BYTES:
+                jpeg_bytes = pix.tobytes("jpeg", jpg_quality=85)
+                if len(jpeg_bytes) < len(image_bytes):
+                    mime, image_bytes = "image/jpeg", jpeg_bytes
+                del jpeg_bytes
+            # Drop the raw pixmap before base64 so it is never alive alongside the text copy.
+            del pix, page
         if not image_bytes:
             return ""
-        return base64.b64encode(image_bytes).decode("ascii")
+        encoded = base64.b64encode(image_bytes)
+        del image_bytes
+        return f"data:{mime};base64,{encoded.decode('ascii')}"
+
+    def _open_pdf_document(self, fitz: Any, pdf_path: str) -> Any:
+        # Recovery OCRs many pages of the same granth; reopening re-parses the xref
+        # table every time. Callers must hold _pdf_lock.
+        mtime = Path(pdf_path).stat().st_mtime
+        cached = self._pdf_documents.get(pdf_path)
+        if cached is not None:
+            opened_mtime, document = cached
+            if opened_mtime == mtime:
+                self._pdf_documents.move_to_end(pdf_path)
+                return document
+            del self._pdf_documents[pdf_path]
+            document.close()
+
+        document = fitz.open(str(Path(pdf_path)))
+        self._pdf_documents[pdf_path] = (mtime, document)
+        while len(self._pdf_documents) > _MAX_OPEN_PDF_DOCUMENTS:
+            _, (_, evicted) = self._pdf_documents.popitem(last=False)
+            evicted.close()
+        return document
+
+    def close_pdf_documents(self) -> None:
+        with self._pdf_lock:
+            while self._pdf_documents:
+                _, (_, document) = self._pdf_documents.popitem(last=False)
+                document.close()
 
     def _complete(
         self,
@@ -448,6 +774,18 @@ class OpenAIClient:
         if not self.enabled or self.client is None:
             raise RuntimeError("OpenAI client unavailable")
 
+        # Near-deterministic calls (planning, memory, conversion) repeat verbatim, so
+        # their replies are reused; sampled generations are never cached.
+        cache_key = None
+        if temperature is not None and temperature <= _COMPLETION_CACHE_MAX_TEMPERATURE:
+            cache_key = hashlib.blake2b(
+                f"{self.chat_model}\0{temperature}\0{prompt}".encode("utf-8", errors="ignore"),
+                digest_size=16,
+            ).digest()
+            cached = self._completion_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
             text = self._responses_text(
                 model=self.chat_model,
@@ -457,11 +795,35 @@ class OpenAIClient:
                 usage_stage=usage_stage,
             )
             self.last_generation_error = None
+            if cache_key is not None and text.strip():
+                self._completion_cache.put(cache_key, text)
             return text
         except Exception as exc:
             self.last_generation_error = f"{type(exc).__name__}: {exc}"
             raise
 
+    def _complete_or_default(
+        self,
+        prompt: str,
+        default: str,
+        *,
+        temperature: float | None = None,
+        usage_collector: UsageCollector | None = None,
+        usage_stage: str | None = None,
+    ) -> str:
+        """Run ``_complete`` and fall back to ``default`` on errors or empty output."""
+
+        try:
+            text = self._complete(
+                prompt,
+                temperature=temperature,
+                usage_collector=usage_collector,
+                usage_stage=usage_stage,
+            ).strip()
+        except Exception:
+            return default
+        return text or default
+
     def _responses_text(
         self,
         *,
@@ -478,21 +840,25 @@ class OpenAIClient:
             "model": model,
             "input": input_payload,
         }
-        if temperature is not None:
+        if temperature is not None and model not in self._rejected_params["temperature"]:
             kwargs["temperature"] = temperature
+        if usage_stage and model not in self._rejected_params["prompt_cache_key"]:
+            # Requests of one stage share a static prompt prefix; a common key routes
+            # them to the same prompt cache.
+            kwargs["prompt_cache_key"] = f"tartam-{usage_stage}"
 
-        response = None
-        try:
-            response = self.client.responses.create(**kwargs)
-        except Exception as exc:
-            message = str(exc).lower()
-            if "temperature" in kwargs and (
-                "unsupported" in message or "unknown parameter" in message or "not allowed" in message
-            ):
-                kwargs.pop("temperature", None)
+        while True:
+            try:
                 response = self.client.responses.create(**kwargs)
-            else:
-                raise
+                break
+            except Exception as exc:
+                rejected = _rejected_optional_params(exc, kwargs)
+                if not rejected:
+                    raise
+                # Each retry drops at least one parameter, so this ends.
+                for key in rejected:
+                    kwargs.pop(key)
+                    self._rejected_params[key].add(model)
 
         usage = self._responses_usage(response)
         if usage_collector and usage_stage and usage["input_tokens"] > 0:
@@ -584,18 +950,16 @@ class OpenAIClient:
         context_constraints: dict[str, Any],
         grounded_facts: list[str],
     ) -> str:
-        context_parts: list[str] = []
-        for idx, citation in enumerate(citations[:6], start=1):
-            context_parts.append(
-                "\n".join(
-                    [
-                        f"[{idx}] Granth: {citation.granth_name}",
-                        f"[{idx}] Prakran: {citation.prakran_name}",
-                        f"[{idx}] Chopai: {' | '.join(citation.chopai_lines)}",
-                        f"[{idx}] Meaning: {citation.meaning_text}",
-                    ]
-                )
+        context_parts = [
+            _citation_block(
+                idx,
+                citation.granth_name,
+                citation.prakran_name,
+                tuple(citation.chopai_lines),
+                citation.meaning_text,
             )
+            for idx, citation in enumerate(citations[:6], start=1)
+        ]
 
         history = "\n".join(
             f"{item.get('role', 'user')}: {item.get('text', '')[:300]}"
@@ -609,28 +973,19 @@ class OpenAIClient:
         )
         deterministic_facts = "\n".join(f"- {item}" for item in grounded_facts if item)
 
-        return (
-            "You are a respectful scripture assistant for Tartam texts.\n"
-            "Strict rule: answer using ONLY the provided citations. Do not invent any scripture facts.\n"
-            "If evidence is weak or missing, reply exactly: "
-            "\"I could not find this clearly in available texts.\" and ask one clarifying question.\n"
-            f"Respond in this style/language mode: {target_style}.\n\n"
-            "Reasoning task: solve user intent by synthesizing evidence across citations, not by copy-pasting.\n"
-            "Output format (must follow):\n"
-            "1) Direct Answer: 2-3 lines answering user's intent clearly.\n"
-            "2) Explanation from Chopai: 3-6 lines interpreting the meaning in simple language.\n"
-            "3) Grounding: one line listing source labels (Granth | Prakran | p.#).\n"
-            "Do not output bracket-only indices like [1] or [2].\n"
-            "Keep the tone devotional and practical, not overly academic.\n\n"
-            f"Planned intent: {plan.get('intent', 'answer_user_question_from_scripture')}\n"
-            f"Required facts to verify:\n{required_facts or '- derive from strongest citations'}\n\n"
-            f"User reference constraints:\n{constraints or '- none'}\n\n"
-            f"Deterministic facts:\n{deterministic_facts or '- none'}\n\n"
-            f"Session memory summary:\n{memory_summary or 'N/A'}\n\n"
-            f"Session key facts:\n{self._format_bullets(memory_key_facts)}\n\n"
-            f"Recent Chat Context:\n{history or 'N/A'}\n\n"
-            f"User Question:\n{question}\n\n"
-            f"Citations:\n{'\n\n'.join(context_parts)}\n"
+        return _GROUNDED_PROMPT_TEMPLATE.format_map(
+            {
+                "target_style": target_style,
+                "intent": plan.get("intent", "answer_user_question_from_scripture"),
+                "required_facts": required_facts or "- derive from strongest citations",
+                "constraints": constraints or "- none",
+                "deterministic_facts": deterministic_facts or "- none",
+                "memory_summary": memory_summary or "N/A",
+                "key_facts": self._format_bullets(memory_key_facts),
+                "history": history or "N/A",
+                "question": question,
+                "citations": "\n\n".join(context_parts),
+            }
         )
 
     def _fallback_memory(
@@ -677,18 +1032,30 @@ class OpenAIClient:
         if not text:
             return None
         try:
-            parsed = json.loads(text)
+            parsed = _loads_json_object(text)
             return parsed if isinstance(parsed, dict) else None
         except Exception:
             pass
 
         start = text.find("{")
-        end = text.rfind("}")
-        if start == -1 or end == -1 or end <= start:
+        if start == -1:
             return None
-        snippet = text[start : end + 1]
-        try:
-            parsed = json.loads(snippet)
+        # Prefer the first balanced object (models often add commentary, sometimes with
+        # braces, after the JSON); fall back to the widest first-{ .. last-} span.
+        end = _balanced_object_end(text, start)
+        last = text.rfind("}")
+        snippets = [text[start : stop + 1] for stop in dict.fromkeys(item for item in (end, last) if item > start)]
+        for snippet in snippets:
+            try:
+                parsed = _loads_json_object(snippet)
+            except Exception:
+                continue
             return parsed if isinstance(parsed, dict) else None
-        except Exception:
-            return None
+
+        # Near-JSON (trailing commas, single quotes, bare keys) would otherwise fall
+        # back to defaults; only replies that already failed strict parsing get here.
+        for snippet in [*snippets, text]:
+            parsed = _lenient_json_loads(snippet)
+            if isinstance(parsed, dict):
+                return parsed
+        return None
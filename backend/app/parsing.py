@@ -1,20 +1,42 @@
 from __future__ import annotations
 
+import logging
 import re
-from dataclasses import dataclass
+import sys
+from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from .language import detect_style, normalize_text, transliterate_to_latin
+from .language import detect_style, normalize_digits, normalize_lines, normalize_text, transliterate_to_latin
 from .pdf_extract import PageText
 
+logger = logging.getLogger(__name__)
 
-_PRAKRAN_PATTERN = re.compile(r"(प्रकरण|પ્રકરણ|પકરણ|पकरण|prakran|prakaran)", re.IGNORECASE)
+
+# The heading keyword as plain substrings. Lines are NFKC-normalized, where
+# str.lower() folds the Roman spellings exactly like an IGNORECASE regex would.
+_PRAKRAN_SCRIPT_WORDS = ("प्रकरण", "પ્રકરણ", "પકરણ", "पकरण")
+_PRAKRAN_ASCII_WORDS = ("prakran", "prakaran")
 _CHOPAI_MARKER_PATTERN = re.compile(r"(॥\s*\d+|\b\d+\s*$|JJ\s*\d+|\]\s*\d+\s*$)", re.IGNORECASE)
+_DASHES = ("-", "–", "—")
 _PRAKRAN_NUM_PREFIX = re.compile(r"^\s*[-–—]\s*(\d{1,3})\s*[-–—]\s*(.*)$")
+# One probe per line: anything that can carry a prakran heading or number (a dash
+# prefix, the keyword, or a -N- marker). Lines without a hit skip the prakran checks.
+_PRAKRAN_HINT = re.compile(r"^\s*[-–—]|प्रकरण|પ્રકરણ|પકરણ|पकरण|prakran|prakaran|-\d{1,3}-", re.IGNORECASE)
+_PRAKRAN_NUMBER_PATTERN = re.compile(
+    r"(?:प्रकरण|પ્રકરણ|પકરણ|पकरण|prakran|prakaran)\s*[:\-]?\s*(\d{1,3})", re.IGNORECASE
+)
+_DASH_NUMBER_MARKER = re.compile(r"-(\d{1,3})-")
+_FIRST_NUMBER = re.compile(r"(\d{1,3})")
+_LEADING_DIGITS = re.compile(r"^[0-9]+")
 _MEANING_MARKER = re.compile(
     r"^\s*(meaning|arth|artha|अर्थ|भावार्थ|मतलब|અર્થ|અરથ)\s*[:：-]?\s*",
     re.IGNORECASE,
 )
+# Lowered prefixes the marker can start with ("artha" is covered by "arth").
+_MEANING_PREFIXES = ("meaning", "arth", "अर्थ", "भावार्थ", "मतलब", "અર્થ", "અરથ")
 
 
 @dataclass(slots=True)
@@ -38,40 +60,79 @@ class ParsedUnit:
     chunk_type: str
 
 
-def parse_pdf_to_units(pdf_path: Path, pages: list[PageText]) -> list[ParsedUnit]:
+@dataclass(slots=True)
+class _UnitContent:
+    chopai_lines: list[str]
+    meaning_text: str
+    chopai_number: str | None
+    language_script: str
+    normalized_text: str
+    translit: str
+    chunk_text: str
+
+
+_ContentKey = tuple[tuple[str, ...], tuple[str, ...]]
+
+# Below this many pages the process round-trips cost more than they save.
+_PARALLEL_MIN_PAGES = 16
+
+
+def parse_pdf_to_units(pdf_path: Path, pages: list[PageText], executor: Executor | None = None) -> list[ParsedUnit]:
+    return list(iter_pdf_units(pdf_path, pages, executor=executor))
+
+
+def iter_pdf_units(pdf_path: Path, pages: list[PageText], executor: Executor | None = None) -> Iterator[ParsedUnit]:
     granth = infer_granth_name(pdf_path)
     source_set = infer_source_set(pdf_path)
     current_prakran = "Prakran not parsed"
     current_prakran_number: int | None = None
     current_prakran_confidence: float = 0.0
 
-    units: list[ParsedUnit] = []
+    # How a page's lines group into units does not depend on the prakran state
+    # carried in from earlier pages; only the labels do. So the expensive part of
+    # each unit (normalization, script detection, transliteration) can be computed
+    # page-parallel, and the sequential pass below just threads the state through.
+    contents: dict[_ContentKey, _UnitContent] = {}
+    if executor is not None and len(pages) >= _PARALLEL_MIN_PAGES:
+        try:
+            for page_contents in executor.map(_page_unit_contents, pages, chunksize=8):
+                contents.update(page_contents)
+        except Exception:
+            # The contents are only a cache: the sequential pass computes any unit
+            # that is missing, e.g. after a worker died and broke the pool.
+            logger.warning("Parallel parsing failed for %s; parsing sequentially", pdf_path)
+            contents.clear()
+
+    # Every unit of one PDF shares the granth, so the prakran name alone keys the
+    # running index. A prakran can reappear after another one, so groupby won't do.
+    counters: defaultdict[str, int] = defaultdict(int)
+    # One string shared by every unit instead of a str(Path) copy per unit.
+    pdf_path_text = str(pdf_path)
+    # Each page's units are appended to the same buffer, emptied once yielded.
+    page_units: list[ParsedUnit] = []
 
     for page in pages:
-        page_units, current_prakran, current_prakran_number, current_prakran_confidence = _parse_page(
+        current_prakran, current_prakran_number, current_prakran_confidence = _parse_page(
             granth,
             source_set,
-            pdf_path,
+            pdf_path_text,
             page,
             current_prakran,
             current_prakran_number,
             current_prakran_confidence,
+            page_units,
+            contents,
         )
-        units.extend(page_units)
-
-    if not units:
-        return []
-    counters: dict[tuple[str, str], int] = {}
-    for unit in units:
-        key = (unit.granth_name, unit.prakran_name)
-        counters[key] = counters.get(key, 0) + 1
-        unit.prakran_chopai_index = counters[key]
-    return units
+        for unit in page_units:
+            index = counters[unit.prakran_name] + 1
+            counters[unit.prakran_name] = unit.prakran_chopai_index = index
+            yield unit
+        page_units.clear()
 
 
 def infer_granth_name(pdf_path: Path) -> str:
     name = pdf_path.stem
-    name = re.sub(r"^[0-9]+", "", name).strip()
+    name = _LEADING_DIGITS.sub("", name).strip()
     name = name.replace("GCM", "").strip("-_ ")
     return name or pdf_path.stem
 
@@ -86,50 +147,48 @@ def infer_source_set(pdf_path: Path) -> str:
 
 
 def _clean_lines(text: str) -> list[str]:
-    lines = [normalize_text(line) for line in (text or "").splitlines()]
-    result: list[str] = []
-    for line in lines:
-        if not line:
-            continue
-        # Keep -14- style markers because many Tartam PDFs encode prakran this way.
-        # Only drop plain page-number-like lines.
-        if re.fullmatch(r"[0-9]{1,4}", line):
-            continue
-        if len(line) <= 1:
-            continue
-        result.append(line)
-    return result
-
-
-def _normalize_digits(text: str) -> str:
-    if not text:
-        return ""
-    dev = "०१२३४५६७८९"
-    guj = "૦૧૨૩૪૫૬૭૮૯"
-    translation = {ord(ch): str(idx) for idx, ch in enumerate(dev)}
-    translation.update({ord(ch): str(idx) for idx, ch in enumerate(guj)})
-    return text.translate(translation)
+    # Keep -14- style markers because many Tartam PDFs encode prakran this way.
+    # Only drop plain page-number-like lines (and empty or single-char ones).
+    return [
+        line
+        for line in normalize_lines(text)
+        if len(line) > 1 and not (len(line) <= 4 and line.isascii() and line.isdigit())
+    ]
 
 
-def _extract_prakran_number_any(text: str) -> int | None:
-    normalized = _normalize_digits(text)
+# The prakran extractors below take a line that already went through normalize_digits.
+def _extract_prakran_number_any(normalized: str) -> int | None:
     if not normalized:
         return None
-    match = re.search(r"(?:प्रकरण|પ્રકરણ|પકરણ|पकरण|prakran|prakaran)\s*[:\-]?\s*(\d{1,3})", normalized, re.IGNORECASE)
+    match = _PRAKRAN_NUMBER_PATTERN.search(normalized)
     if match:
         return int(match.group(1))
-    marker = re.search(r"-(\d{1,3})-", normalized)
+    marker = _DASH_NUMBER_MARKER.search(normalized) if "-" in normalized else None
     if marker:
         return int(marker.group(1))
     return None
 
 
 def _looks_like_prakran(line: str) -> bool:
-    return bool(_PRAKRAN_PATTERN.search(line)) and len(line) <= 120
+    if len(line) > 120:
+        return False
+    if any(word in line for word in _PRAKRAN_SCRIPT_WORDS):
+        return True
+    lowered = line.lower()
+    return any(word in lowered for word in _PRAKRAN_ASCII_WORDS)
+
+
+def _starts_with_meaning_marker(line: str) -> bool:
+    # Same test as _MEANING_MARKER.match without Unicode case folding in the regex
+    # engine; the regex is only needed to strip a marker that is present.
+    return line.lstrip()[:16].lower().startswith(_MEANING_PREFIXES)
 
 
 def _extract_prakran_from_prefix(line: str) -> tuple[str | None, int | None, float, str]:
-    match = _PRAKRAN_NUM_PREFIX.match(_normalize_digits(line))
+    # Most hint lines carry the keyword rather than a "-N-" prefix.
+    if not line.lstrip().startswith(_DASHES):
+        return None, None, 0.0, line
+    match = _PRAKRAN_NUM_PREFIX.match(line)
     if not match:
         return None, None, 0.0, line
     number = int(match.group(1))
@@ -140,8 +199,7 @@ def _extract_prakran_from_prefix(line: str) -> tuple[str | None, int | None, flo
 def _extract_prakran_from_keyword(line: str) -> tuple[str | None, int | None, float]:
     if not _looks_like_prakran(line):
         return None, None, 0.0
-    normalized = _normalize_digits(line)
-    number_match = re.search(r"(\d{1,3})", normalized)
+    number_match = _FIRST_NUMBER.search(line)
     if number_match:
         number = int(number_match.group(1))
         return f"Prakran {number}", number, 0.86
@@ -149,13 +207,40 @@ def _extract_prakran_from_keyword(line: str) -> tuple[str | None, int | None, fl
 
 
 def _extract_chopai_number(line: str) -> str | None:
-    match = re.search(r"(\d{1,4})\s*$", line)
-    return match.group(1) if match else None
+    # The last (up to four) digits before trailing whitespace; isdecimal() is the
+    # same digit class as the regex \d, so Indic digits still count.
+    line = line.rstrip()
+    end = len(line)
+    start = end
+    while start > max(end - 4, 0) and line[start - 1].isdecimal():
+        start -= 1
+    return line[start:end] if start < end else None
+
+
+def _may_carry_prakran(line: str) -> bool:
+    # Plain substring tests that every _PRAKRAN_HINT match implies: a dash, the
+    # "कर"/"કર" inside each keyword, or an "ak" of prakran in any ASCII case (lines
+    # are NFKC-normalized, so no other case variants remain). Few lines have any.
+    return (
+        "-" in line
+        or "–" in line
+        or "—" in line
+        or "कर" in line
+        or "કર" in line
+        or "ak" in line
+        or "Ak" in line
+        or "aK" in line
+        or "AK" in line
+    )
 
 
 def _looks_like_chopai_marker(line: str) -> bool:
     if len(line) > 220:
         return False
+    # Every alternative needs a trailing digit, a danda or "jj"; most prose lines
+    # have none of them and never reach the regex engine.
+    if not (line.rstrip()[-1:].isdecimal() or "॥" in line or "j" in line or "J" in line):
+        return False
     return bool(_CHOPAI_MARKER_PATTERN.search(line))
 
 
@@ -172,53 +257,85 @@ def _build_unit(
     prakran: str,
     prakran_number: int | None,
     prakran_confidence: float | None,
-    pdf_path: Path,
+    pdf_path: str,
     source_set: str,
     page_number: int,
     chopai_lines: list[str],
     meaning_lines: list[str],
     chunk_type: str,
+    contents: dict[_ContentKey, _UnitContent] | None = None,
 ) -> ParsedUnit:
-    chopai_clean, meaning_text = _split_chopai_and_meaning(chopai_lines, meaning_lines)
-    combined = "\n".join([*chopai_clean, meaning_text]).strip()
-    style = detect_style(combined)
-    script_name = _script_name(style)
-    normalized = normalize_text(combined)
-
-    translit = transliterate_to_latin(combined).lower()
+    content = None
+    if contents is not None:
+        key = (tuple(chopai_lines), tuple(meaning_lines))
+        content = contents.get(key)
+        if content is None:
+            content = contents[key] = _unit_content(chopai_lines, meaning_lines)
+    else:
+        content = _unit_content(chopai_lines, meaning_lines)
 
     return ParsedUnit(
         granth_name=granth,
         prakran_name=prakran,
         prakran_number=prakran_number,
         prakran_confidence=prakran_confidence,
-        chopai_number=_extract_chopai_number(chopai_clean[-1] if chopai_clean else ""),
+        chopai_number=content.chopai_number,
         prakran_chopai_index=None,
-        chopai_lines=chopai_clean,
-        meaning_text=meaning_text,
-        language_script=script_name,
+        chopai_lines=list(content.chopai_lines),
+        meaning_text=content.meaning_text,
+        # Worker processes hand back unpickled copies; interning keeps one object each.
+        language_script=sys.intern(content.language_script),
         page_number=page_number,
-        pdf_path=str(pdf_path),
+        pdf_path=pdf_path,
         source_set=source_set,
+        normalized_text=content.normalized_text,
+        translit_hi_latn=content.translit,
+        translit_gu_latn=content.translit,
+        chunk_text=content.chunk_text,
+        chunk_type=chunk_type,
+    )
+
+
+def _unit_content(chopai_lines: list[str], meaning_lines: list[str]) -> _UnitContent:
+    chopai_clean, meaning_text = _split_chopai_and_meaning(chopai_lines, meaning_lines)
+    combined = "\n".join([*chopai_clean, meaning_text]).strip()
+    # Every piece is already normalize_text output, so normalizing the combined text
+    # only turns the newlines into spaces. Style detection and transliteration get
+    # that string, for which their own normalize_text call is a no-op.
+    normalized = " ".join([*chopai_clean, meaning_text]).strip()
+
+    return _UnitContent(
+        chopai_lines=chopai_clean,
+        meaning_text=meaning_text,
+        chopai_number=_extract_chopai_number(chopai_clean[-1] if chopai_clean else ""),
+        language_script=_script_name(detect_style(normalized)),
         normalized_text=normalized,
-        translit_hi_latn=translit,
-        translit_gu_latn=translit,
+        translit=transliterate_to_latin(normalized).lower(),
         chunk_text=combined,
-        chunk_type=chunk_type,
     )
 
 
+def _page_unit_contents(page: PageText) -> dict[_ContentKey, _UnitContent]:
+    # Worker entry point: parse with placeholder labels and keep only the
+    # label-independent unit contents.
+    contents: dict[_ContentKey, _UnitContent] = {}
+    _parse_page("", "", "", page, "Prakran not parsed", None, 0.0, [], contents)
+    return contents
+
+
 def _split_chopai_and_meaning(chopai_lines: list[str], meaning_lines: list[str]) -> tuple[list[str], str]:
-    chopai_clean = [normalize_text(item) for item in chopai_lines[:2] if normalize_text(item)]
-    meaning_clean = [normalize_text(item) for item in meaning_lines if normalize_text(item)]
-    all_lines = [line for line in [*chopai_clean, *meaning_clean] if line]
+    # Lines come from _clean_lines (or a prefix remainder): already normalize_text
+    # output and never empty, so they are used as they are.
+    chopai_clean = chopai_lines[:2]
+    meaning_clean = list(meaning_lines)
+    all_lines = [*chopai_clean, *meaning_clean]
 
-    marker_idx = next((idx for idx, line in enumerate(all_lines) if _MEANING_MARKER.match(line)), None)
+    marker_idx = next((idx for idx, line in enumerate(all_lines) if _starts_with_meaning_marker(line)), None)
     if marker_idx is not None:
         marker_line = all_lines[marker_idx]
         marker_content = _MEANING_MARKER.sub("", marker_line).strip()
-        before = [line for line in all_lines[:marker_idx] if line]
-        after = [line for line in all_lines[marker_idx + 1 :] if line]
+        before = all_lines[:marker_idx]
+        after = all_lines[marker_idx + 1 :]
 
         if not chopai_clean:
             chopai_clean = before[:2] if before else all_lines[:2]
@@ -244,140 +361,145 @@ def _split_chopai_and_meaning(chopai_lines: list[str], meaning_lines: list[str])
     return chopai_clean[:2] or ["Chopai unavailable"], meaning_text or "Meaning unavailable"
 
 
+@dataclass(slots=True)
+class _PageState:
+    granth: str
+    source_set: str
+    pdf_path: str
+    page_number: int
+    prakran: str
+    prakran_number: int | None
+    prakran_confidence: float
+    units: list[ParsedUnit]
+    contents: dict[_ContentKey, _UnitContent] | None = None
+    pending_chopai: list[str] = field(default_factory=list)
+    pending_meaning: list[str] = field(default_factory=list)
+
+    def set_prakran(self, prakran: str, number: int | None, confidence: float) -> None:
+        # Headings are rebuilt as fresh f-strings; many units share a handful of names.
+        self.prakran = sys.intern(prakran)
+        self.prakran_number = number
+        self.prakran_confidence = confidence
+
+    def emit(self, chopai_lines: list[str], meaning_lines: list[str], chunk_type: str) -> None:
+        self.units.append(
+            _build_unit(
+                granth=self.granth,
+                prakran=self.prakran,
+                prakran_number=self.prakran_number,
+                prakran_confidence=self.prakran_confidence,
+                pdf_path=self.pdf_path,
+                source_set=self.source_set,
+                page_number=self.page_number,
+                chopai_lines=chopai_lines,
+                meaning_lines=meaning_lines,
+                chunk_type=chunk_type,
+                contents=self.contents,
+            )
+        )
+
+    def flush(self) -> None:
+        if not self.pending_chopai and not self.pending_meaning:
+            return
+        chopai = self.pending_chopai[:2] if self.pending_chopai else [self.pending_meaning[0]]
+        self.emit(chopai, self.pending_meaning, "combined")
+        # Units keep copies of their lines, so the pending lists are emptied in
+        # place; _parse_page holds on to their bound append methods.
+        self.pending_chopai.clear()
+        self.pending_meaning.clear()
+
+
 def _parse_page(
     granth: str,
     source_set: str,
-    pdf_path: Path,
+    pdf_path: str,
     page: PageText,
     incoming_prakran: str,
     incoming_prakran_number: int | None,
     incoming_prakran_confidence: float,
-) -> tuple[list[ParsedUnit], str, int | None, float]:
+    units_out: list[ParsedUnit],
+    contents: dict[_ContentKey, _UnitContent] | None = None,
+) -> tuple[str, int | None, float]:
+    # The page's units are appended to units_out; the prakran state is returned.
     lines = _clean_lines(page.text)
     if not lines:
-        return [], incoming_prakran, incoming_prakran_number, incoming_prakran_confidence
-
-    current_prakran = incoming_prakran
-    current_prakran_number = incoming_prakran_number
-    current_prakran_confidence = incoming_prakran_confidence
-    units: list[ParsedUnit] = []
-
-    pending_chopai: list[str] = []
-    pending_meaning: list[str] = []
+        return incoming_prakran, incoming_prakran_number, incoming_prakran_confidence
 
+    state = _PageState(
+        granth=granth,
+        source_set=source_set,
+        pdf_path=pdf_path,
+        page_number=page.page_number,
+        prakran=incoming_prakran,
+        prakran_number=incoming_prakran_number,
+        prakran_confidence=incoming_prakran_confidence,
+        units=units_out,
+        contents=contents,
+    )
+    units_before = len(units_out)
+    pending_chopai = state.pending_chopai
+    pending_meaning = state.pending_meaning
+    append_chopai = pending_chopai.append
+    append_meaning = pending_meaning.append
     prev_line = ""
 
-    def flush_current() -> None:
-        nonlocal pending_chopai, pending_meaning
-        if not pending_chopai and not pending_meaning:
-            return
-        chopai = pending_chopai[:2] if pending_chopai else [pending_meaning[0]]
-        unit = _build_unit(
-            granth=granth,
-            prakran=current_prakran,
-            prakran_number=current_prakran_number,
-            prakran_confidence=current_prakran_confidence,
-            pdf_path=pdf_path,
-            source_set=source_set,
-            page_number=page.page_number,
-            chopai_lines=chopai,
-            meaning_lines=pending_meaning,
-            chunk_type="combined",
-        )
-        units.append(unit)
-        pending_chopai = []
-        pending_meaning = []
-
     for line in lines:
-        prakran_from_prefix, prakran_from_prefix_number, prefix_conf, remainder = _extract_prakran_from_prefix(line)
-        if prakran_from_prefix:
-            flush_current()
-            current_prakran = prakran_from_prefix
-            current_prakran_number = prakran_from_prefix_number
-            current_prakran_confidence = prefix_conf
-            if remainder:
-                line = remainder
-            else:
+        if _may_carry_prakran(line) and _PRAKRAN_HINT.search(line):
+            # All three prakran probes read the digit-normalized line; translate it once.
+            digits_line = normalize_digits(line)
+            prakran_from_prefix, prakran_from_prefix_number, prefix_conf, remainder = _extract_prakran_from_prefix(
+                digits_line
+            )
+            if prakran_from_prefix:
+                state.flush()
+                state.set_prakran(prakran_from_prefix, prakran_from_prefix_number, prefix_conf)
+                if remainder:
+                    # Built from the normalized line, so its digits are already ASCII.
+                    line = digits_line = remainder
+                else:
+                    prev_line = line
+                    continue
+
+            prakran_from_keyword, prakran_from_keyword_number, keyword_conf = _extract_prakran_from_keyword(digits_line)
+            if prakran_from_keyword:
+                state.flush()
+                state.set_prakran(prakran_from_keyword, prakran_from_keyword_number, keyword_conf)
                 prev_line = line
                 continue
 
-        prakran_from_keyword, prakran_from_keyword_number, keyword_conf = _extract_prakran_from_keyword(line)
-        if prakran_from_keyword:
-            flush_current()
-            current_prakran = prakran_from_keyword
-            current_prakran_number = prakran_from_keyword_number
-            current_prakran_confidence = keyword_conf
-            prev_line = line
-            continue
-
-        marker_num = _extract_prakran_number_any(line)
-        if marker_num is not None and current_prakran_number is None:
-            current_prakran_number = marker_num
-            current_prakran = f"Prakran {marker_num}"
-            current_prakran_confidence = max(current_prakran_confidence, 0.62)
+            marker_num = _extract_prakran_number_any(digits_line)
+            if marker_num is not None and state.prakran_number is None:
+                state.set_prakran(f"Prakran {marker_num}", marker_num, max(state.prakran_confidence, 0.62))
 
         if _looks_like_chopai_marker(line):
             carry_line = None
             if pending_chopai:
-                flush_current()
+                state.flush()
             elif pending_meaning:
                 # The line right before chopai marker is usually the first chopai line.
                 carry_line = pending_meaning.pop()
                 # Drop unstructured leading lines instead of emitting a noisy partial unit.
-                pending_meaning = []
+                pending_meaning.clear()
             else:
-                flush_current()
-            candidate_lines: list[str] = []
+                state.flush()
+            # Both pending lists are empty here; the new unit starts with at most two lines.
             if carry_line:
-                candidate_lines.append(carry_line)
-            elif prev_line and prev_line != current_prakran:
-                candidate_lines.append(prev_line)
-            candidate_lines.append(line)
-            pending_chopai = candidate_lines[-2:]
+                append_chopai(carry_line)
+            elif prev_line and prev_line != state.prakran:
+                append_chopai(prev_line)
+            append_chopai(line)
             prev_line = line
             continue
 
-        if pending_chopai:
-            pending_meaning.append(line)
-        else:
-            pending_meaning.append(line)
+        append_meaning(line)
         prev_line = line
 
-    flush_current()
+    state.flush()
 
-    if not units:
+    if len(units_out) == units_before:
         # Fallback chunking for pages that do not match chopai patterns.
-        block: list[str] = []
-        for line in lines:
-            block.append(line)
-            if len(block) >= 6:
-                unit = _build_unit(
-                    granth=granth,
-                    prakran=current_prakran,
-                    prakran_number=current_prakran_number,
-                    prakran_confidence=current_prakran_confidence,
-                    pdf_path=pdf_path,
-                    source_set=source_set,
-                    page_number=page.page_number,
-                    chopai_lines=block[:2],
-                    meaning_lines=block[2:],
-                    chunk_type="fallback",
-                )
-                units.append(unit)
-                block = []
-        if block:
-            unit = _build_unit(
-                granth=granth,
-                prakran=current_prakran,
-                prakran_number=current_prakran_number,
-                prakran_confidence=current_prakran_confidence,
-                pdf_path=pdf_path,
-                source_set=source_set,
-                page_number=page.page_number,
-                chopai_lines=block[:2],
-                meaning_lines=block[2:],
-                chunk_type="fallback",
-            )
-            units.append(unit)
+        for start in range(0, len(lines), 6):
+            block = lines[start : start + 6]
+            state.emit(block[:2], block[2:], "fallback")
 
-    return units, current_prakran, current_prakran_number, current_prakran_confidence
+    return state.prakran, state.prakran_number, state.prakran_confidence
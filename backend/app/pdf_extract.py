@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
+from typing import Any
 
 from pypdf import PdfReader
 
@@ -32,15 +36,32 @@ class PDFExtractionError(RuntimeError):
 
 
 _OCR_DEPS_MISSING_WARNED = False
+# Below this many pages the worker round-trips cost more than they save.
+_PARALLEL_MIN_PAGES = 16
+_PAGES_PER_TASK = 16
+_OCR_PAGES_PER_RENDER = 8
+_OCR_MAX_WORKERS = 4
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F]")
+_WORKER_READERS_PER_THREAD = 2
+# pypdf readers are not thread-safe, so each worker thread keeps its own.
+_worker_local = threading.local()
 
 
 def _text_quality_score(text: str) -> float:
     if not text:
         return 0.0
 
-    printable = sum(1 for ch in text if ch.isprintable())
-    alpha = sum(1 for ch in text if ch.isalpha())
-    weird = len(re.findall(r"[\x00-\x08\x0B\x0C\x0E-\x1F]", text))
+    # Newlines are the only non-printable characters on almost every page, so one
+    # C-level isprintable() over the rest usually settles the printable count.
+    without_newlines = text.replace("\n", "")
+    if without_newlines.isprintable():
+        printable = len(without_newlines)
+        # Control characters are not printable, so there are none to count.
+        weird = 0
+    else:
+        printable = sum(map(str.isprintable, text))
+        weird = len(_CONTROL_CHARS.findall(text))
+    alpha = sum(map(str.isalpha, text))
 
     printable_ratio = printable / max(len(text), 1)
     alpha_ratio = alpha / max(len(text), 1)
@@ -54,60 +75,67 @@ def extract_pdf_pages(
     enable_ocr_fallback: bool = False,
     ocr_quality_threshold: float = 0.22,
     force_on_garbled: bool = True,
+    executor: Executor | None = None,
 ) -> tuple[list[PageText], int]:
-    try:
-        reader = PdfReader(str(pdf_path))
-    except Exception as exc:  # pragma: no cover - parser dependent
-        raise PDFExtractionError(f"Could not open PDF: {pdf_path}") from exc
-
-    if reader.is_encrypted:
-        unlocked = False
-        for pwd in ("", " ", None):
-            try:
-                if pwd is None:
-                    continue
-                if reader.decrypt(pwd):
-                    unlocked = True
-                    break
-            except Exception:
-                continue
-        if not unlocked:
-            try:
-                reader.decrypt("")
-            except Exception as exc:
-                raise PDFExtractionError(
-                    f"Could not decrypt PDF: {pdf_path}. Ensure pycryptodome is installed for AES PDFs."
-                ) from exc
+    reader = _open_reader(pdf_path)
 
     pages: list[PageText] = []
     ocr_pages = 0
 
+    # Only the page count is read up front; page objects are loaded one at a time
+    # below, and not at all in this process when workers extract the text.
     try:
-        page_objects = list(reader.pages)
+        page_count = len(reader.pages)
     except Exception as exc:
         raise PDFExtractionError(
             f"Could not read PDF pages for {pdf_path}. "
             "AES decryption support may be missing (install pycryptodome)."
         ) from exc
 
-    for idx, page in enumerate(page_objects, start=1):
-        raw = ""
+    # extract_text is pure-Python and holds the GIL, so long PDFs are split into
+    # page ranges that worker processes extract from their own reader.
+    raw_texts: list[str] | None = None
+    if executor is not None and page_count >= _PARALLEL_MIN_PAGES:
+        starts = range(0, page_count, _PAGES_PER_TASK)
+        stops = [min(start + _PAGES_PER_TASK, page_count) for start in starts]
         try:
-            raw = page.extract_text() or ""
+            raw_texts = [
+                text
+                for chunk in executor.map(_extract_page_texts, repeat(str(pdf_path)), starts, stops)
+                for text in chunk
+            ]
         except Exception:
-            raw = ""
+            logger.warning("Parallel text extraction failed for %s; extracting sequentially", pdf_path)
+            raw_texts = None
 
-        quality = _text_quality_score(raw)
+    scored: list[tuple[str, float, bool, str]] = []
+    for idx in range(1, page_count + 1):
         method = "pdf"
+        if raw_texts is not None:
+            raw = raw_texts[idx - 1]
+        else:
+            try:
+                raw = _page_text(reader.pages[idx - 1])
+            except Exception:
+                # A malformed page object costs that page, not the whole PDF.
+                logger.warning("Could not load page %s of %s", idx, pdf_path)
+                raw = ""
+                method = "error"
 
-        text = raw
+        quality = _text_quality_score(raw)
         should_ocr = enable_ocr_fallback and (
             quality < max(0.0, min(1.0, ocr_quality_threshold))
             or (force_on_garbled and is_garbled_text(raw))
             or likely_misencoded_indic_text(raw)
         )
+        scored.append((raw, quality, should_ocr, method))
+
+    ocr_texts = _extract_pages_ocr(pdf_path, [idx for idx, item in enumerate(scored, start=1) if item[2]])
+
+    for idx, (raw, quality, should_ocr, method) in enumerate(scored, start=1):
+        text = raw
         if should_ocr:
-            ocr = _extract_page_ocr(pdf_path, idx)
+            ocr = ocr_texts.get(idx, "")
             if ocr:
                 ocr_quality = _text_quality_score(ocr)
                 use_ocr = is_garbled_text(raw) or (ocr_quality >= quality + 0.02)
@@ -129,22 +157,104 @@ def extract_pdf_pages(
     return pages, ocr_pages
 
 
-def _extract_page_ocr(pdf_path: Path, page_number: int) -> str:
+def _open_reader(pdf_path: Path) -> PdfReader:
+    try:
+        reader = PdfReader(str(pdf_path))
+    except Exception as exc:  # pragma: no cover - parser dependent
+        raise PDFExtractionError(f"Could not open PDF: {pdf_path}") from exc
+
+    if reader.is_encrypted:
+        unlocked = False
+        for pwd in ("", " ", None):
+            try:
+                if pwd is None:
+                    continue
+                if reader.decrypt(pwd):
+                    unlocked = True
+                    break
+            except Exception:
+                continue
+        if not unlocked:
+            try:
+                reader.decrypt("")
+            except Exception as exc:
+                raise PDFExtractionError(
+                    f"Could not decrypt PDF: {pdf_path}. Ensure pycryptodome is installed for AES PDFs."
+                ) from exc
+    return reader
+
+
+def _page_text(page: Any) -> str:
+    try:
+        return page.extract_text() or ""
+    except Exception:
+        return ""
+
+
+def _extract_page_texts(pdf_path: str, start: int, stop: int) -> list[str]:
+    # Worker entry point: raw text of pages [start, stop) (0-based). Errors are not
+    # swallowed here: a failed range sends the whole PDF down the sequential path
+    # instead of coming back as blank pages.
+    pages = _worker_reader(pdf_path, Path(pdf_path).stat().st_mtime_ns).pages
+    return [pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def _worker_reader(pdf_path: str, mtime_ns: int) -> PdfReader:
+    # A worker usually gets several page ranges of the same book in a row. Keeping
+    # its reader avoids re-reading the file, re-parsing the xref table and
+    # re-decrypting for every range, and keeps pypdf's per-font caches warm.
+    readers: dict[tuple[str, int], PdfReader] | None = getattr(_worker_local, "readers", None)
+    if readers is None:
+        readers = _worker_local.readers = {}
+    key = (pdf_path, mtime_ns)
+    reader = readers.get(key)
+    if reader is None:
+        if len(readers) >= _WORKER_READERS_PER_THREAD:
+            readers.pop(next(iter(readers)))
+        reader = readers[key] = _open_reader(Path(pdf_path))
+    return reader
+
+
+def _extract_pages_ocr(pdf_path: Path, page_numbers: list[int]) -> dict[int, str]:
     global _OCR_DEPS_MISSING_WARNED
+    if not page_numbers:
+        return {}
     if convert_from_path is None or pytesseract is None:
         if not _OCR_DEPS_MISSING_WARNED:
             logger.warning(
                 "OCR dependencies missing; skipping local OCR fallback. Install pdf2image + pytesseract + tesseract binary."
             )
             _OCR_DEPS_MISSING_WARNED = True
-        return ""
+        return {}
+
+    # Adjacent pages are rasterized by one Poppler call instead of one per page;
+    # runs stay short so only a few 300 dpi images are held per worker. Tesseract
+    # runs as a subprocess, so the runs overlap on a small thread pool.
+    runs: list[list[int]] = []
+    for number in page_numbers:
+        if runs and number == runs[-1][-1] + 1 and len(runs[-1]) < _OCR_PAGES_PER_RENDER:
+            runs[-1].append(number)
+        else:
+            runs.append([number])
+
+    texts: dict[int, str] = {}
+    with ThreadPoolExecutor(max_workers=min(_OCR_MAX_WORKERS, len(runs)), thread_name_prefix="ocr") as pool:
+        for run_texts in pool.map(lambda run: _ocr_page_run(pdf_path, run), runs):
+            texts.update(run_texts)
+    return texts
 
+
+def _ocr_page_run(pdf_path: Path, run: list[int]) -> dict[int, str]:
     try:  # pragma: no cover - OCR integration
-        images = convert_from_path(str(pdf_path), first_page=page_number, last_page=page_number, dpi=300)
-        if not images:
-            return ""
-        text = pytesseract.image_to_string(images[0], lang="hin+guj+eng")
-        return text or ""
+        images = convert_from_path(str(pdf_path), first_page=run[0], last_page=run[-1], dpi=300)
     except Exception:
-        logger.exception("OCR failed for %s page %s", pdf_path, page_number)
-        return ""
+        logger.exception("OCR failed for %s pages %s-%s", pdf_path, run[0], run[-1])
+        return {}
+
+    texts: dict[int, str] = {}
+    for page_number, image in zip(run, images):
+        try:  # pragma: no cover - OCR integration
+            texts[page_number] = pytesseract.image_to_string(image, lang="hin+guj+eng") or ""
+        except Exception:
+            logger.exception("OCR failed for %s page %s", pdf_path, page_number)
+    return texts
@@ -5,6 +5,7 @@ import unicodedata
 from dataclasses import dataclass
 
 from .db import RetrievedUnit
+from .language import normalize_digits
 
 
 _PRAKRAN_WORDS = r"(?:prakran|prakaran|प्रकरण|पकरण|પ્રકરણ|પકરણ)"
@@ -112,7 +113,7 @@ def parse_query_context(
     prakran_number = _extract_single_prakran_number(lowered) if not prakran_range else None
     chopai_number = _extract_chopai_number(lowered)
 
-    filter_prakran_number = _extract_first_number(_normalize_digits(filter_prakran or ""))
+    filter_prakran_number = _extract_first_number(normalize_digits(filter_prakran or ""))
     if filter_prakran_number is not None and prakran_number is None and prakran_range is None:
         prakran_number = filter_prakran_number
 
@@ -210,7 +211,7 @@ def unit_matches_query(unit: RetrievedUnit, query: QueryContext) -> bool:
         return False
 
     if query.chopai_number is not None:
-        parsed = _extract_first_number(_normalize_digits(unit.chopai_number or ""))
+        parsed = _extract_first_number(normalize_digits(unit.chopai_number or ""))
         prakran_idx = unit.prakran_chopai_index
         if parsed != query.chopai_number and prakran_idx != query.chopai_number:
             return False
@@ -235,9 +236,9 @@ def unit_matches_prakran(unit: RetrievedUnit, prakran_number: int) -> bool:
 
     candidate_text = " ".join(
         [
-            _normalize_digits(unit.prakran_name),
-            _normalize_digits(unit.chunk_text[:900]),
-            _normalize_digits(unit.normalized_text[:900]),
+            normalize_digits(unit.prakran_name),
+            normalize_digits(unit.chunk_text[:900]),
+            normalize_digits(unit.normalized_text[:900]),
         ]
     ).lower()
 
@@ -329,7 +330,7 @@ def _extract_prakran_range(text: str) -> tuple[int, int] | None:
         rf"{_PRAKRAN_WORDS}\s*(\d{{1,3}})\s*(?:to|se|thi|થી|से|[-–—])\s*(\d{{1,3}})",
         re.IGNORECASE,
     )
-    match = pattern.search(_normalize_digits(text))
+    match = pattern.search(normalize_digits(text))
     if match:
         return int(match.group(1)), int(match.group(2))
 
@@ -337,7 +338,7 @@ def _extract_prakran_range(text: str) -> tuple[int, int] | None:
         rf"(\d{{1,3}})\s*(?:to|se|thi|થી|से|[-–—])\s*(\d{{1,3}})\s*{_PRAKRAN_WORDS}",
         re.IGNORECASE,
     )
-    match = reverse_pattern.search(_normalize_digits(text))
+    match = reverse_pattern.search(normalize_digits(text))
     if not match:
         return None
     return int(match.group(1)), int(match.group(2))
@@ -345,14 +346,14 @@ def _extract_prakran_range(text: str) -> tuple[int, int] | None:
 
 def _extract_single_prakran_number(text: str) -> int | None:
     pattern = re.compile(rf"{_PRAKRAN_WORDS}\s*(\d{{1,3}})", re.IGNORECASE)
-    match = pattern.search(_normalize_digits(text))
+    match = pattern.search(normalize_digits(text))
     if not match:
         return None
     return int(match.group(1))
 
 
 def _extract_chopai_number(text: str) -> int | None:
-    source = _normalize_digits(text)
+    source = normalize_digits(text)
     direct = re.search(rf"{_CHOPAI_WORDS}\s*(\d{{1,4}})", source, flags=re.IGNORECASE)
     if direct:
         return int(direct.group(1))
@@ -381,23 +382,12 @@ def _has_any_token(text: str, terms: set[str]) -> bool:
     return any(item in tokenized for item in terms)
 
 
-def _normalize_digits(text: str) -> str:
-    if not text:
-        return ""
-
-    dev = "०१२३४५६७८९"
-    guj = "૦૧૨૩૪૫૬૭૮૯"
-    translation = {ord(ch): str(idx) for idx, ch in enumerate(dev)}
-    translation.update({ord(ch): str(idx) for idx, ch in enumerate(guj)})
-    return text.translate(translation)
-
-
 def _normalize(text: str) -> str:
     return unicodedata.normalize("NFKC", text or "").strip()
 
 
 def _norm_key(text: str) -> str:
-    text = _normalize_digits(_normalize(text)).lower()
+    text = normalize_digits(_normalize(text)).lower()
     return re.sub(r"[^a-z0-9\u0900-\u097f\u0a80-\u0aff]+", "", text)
 
 
@@ -1,29 +1,41 @@
 from __future__ import annotations
 
 import time
-from collections import defaultdict, deque
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 
 from fastapi import HTTPException, Request
 
+_WINDOW_SECONDS = 60.0
+
 
 class InMemoryRateLimiter:
+    """GCRA limiter: allows bursts of ``max_per_minute`` and refills one slot every
+    ``60 / max_per_minute`` seconds, tracking a single timestamp per client."""
+
     def __init__(self, max_per_minute: int):
         self.max_per_minute = max_per_minute
-        self.bucket: dict[str, deque[float]] = defaultdict(deque)
+        # Theoretical arrival time per client.
+        self.tat: dict[str, float] = {}
+
+    def check(self, request: Request, cost: int = 1) -> None:
+        """Take ``cost`` slots for the request's client or raise 429 without taking any."""
 
-    def dependency(self) -> Callable[[Request], None]:
-        def _check(request: Request) -> None:
-            identifier = request.client.host if request.client else "unknown"
-            now = time.time()
-            window = self.bucket[identifier]
+        # Never awaits, so when called on the event loop the update is atomic without a lock.
+        if self.max_per_minute <= 0:
+            raise HTTPException(status_code=429, detail="Rate limit exceeded")
 
-            while window and (now - window[0]) > 60:
-                window.popleft()
+        identifier = request.client.host if request.client else "unknown"
+        now = time.monotonic()
+        new_tat = max(self.tat.get(identifier, now), now) + cost * _WINDOW_SECONDS / self.max_per_minute
+        # Small tolerance so float rounding never rejects the last slot of a burst.
+        if new_tat - now > _WINDOW_SECONDS + 1e-6:
+            raise HTTPException(status_code=429, detail="Rate limit exceeded")
 
-            if len(window) >= self.max_per_minute:
-                raise HTTPException(status_code=429, detail="Rate limit exceeded")
+        self.tat[identifier] = new_tat
 
-            window.append(now)
+    def dependency(self) -> Callable[[Request], Awaitable[None]]:
+        # Async so FastAPI runs it on the event loop instead of the threadpool.
+        async def _check(request: Request) -> None:
+            self.check(request)
 
         return _check
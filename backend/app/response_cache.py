@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .language import normalize_text
+from .models import ChatRequest
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    value: bytes
+    group: str
+    expires_at: float
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with per-entry TTL for serialized responses.
+
+    Entries belong to a group (the chat session) so one session can be invalidated
+    without touching the others.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._entries: OrderedDict[bytes, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: bytes) -> bytes | None:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: bytes, value: bytes, *, group: str) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = _CacheEntry(value=value, group=group, expires_at=expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_group(self, group: str) -> None:
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.group == group]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def chat_cache_key(payload: ChatRequest) -> bytes:
+    filters = payload.filters
+    parts = [
+        payload.session_id,
+        payload.style_mode,
+        (filters.granth or "") if filters else "",
+        (filters.prakran or "") if filters else "",
+        str(payload.top_k or ""),
+        normalize_text(payload.message).casefold(),
+    ]
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).digest()
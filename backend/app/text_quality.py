@@ -27,9 +27,16 @@ def likely_misencoded_indic_text(text: str) -> bool:
     if len(text) < 80:
         return False
 
-    indic = sum(1 for ch in text if ("\u0900" <= ch <= "\u097f") or ("\u0a80" <= ch <= "\u0aff"))
-    latin = sum(1 for ch in text if ("a" <= ch.lower() <= "z"))
-    punctuation = sum(1 for ch in text if not ch.isalnum() and not ch.isspace())
+    indic = 0
+    latin = 0
+    punctuation = 0
+    for ch in text:
+        if ("\u0900" <= ch <= "\u097f") or ("\u0a80" <= ch <= "\u0aff"):
+            indic += 1
+        elif "a" <= ch.lower() <= "z":
+            latin += 1
+        if not ch.isalnum() and not ch.isspace():
+            punctuation += 1
 
     total = max(len(text), 1)
     indic_ratio = indic / total
@@ -48,6 +48,19 @@ class VectorStore:
                 metadatas=metadatas[start:end],
             )
 
+    def warmup(self) -> None:
+        # Loads the collection's segments and HNSW index so the first chat query
+        # does not pay for it.
+        if not self.available:
+            return
+        try:
+            sample = self.collection.get(limit=1, include=["embeddings"])
+            embeddings = sample.get("embeddings")
+            if embeddings is not None and len(embeddings):
+                self.collection.query(query_embeddings=[list(embeddings[0])], n_results=1, include=["distances"])
+        except Exception:
+            pass
+
     def query(
         self,
         query_embedding: list[float],
@@ -34,6 +34,7 @@ def run_eval(input_path: Path, top_k: int) -> None:
         embedding_model=settings.openai_embedding_model,
         vision_model=settings.openai_vision_model,
     )
+    llm.warmup_in_background()
     retrieval = RetrievalService(db=db, vectors=vectors, llm=llm)
     pricing_catalog = PricingCatalog.load(settings.pricing_catalog_path)
     fx_service = FxService(
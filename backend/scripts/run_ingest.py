@@ -16,6 +16,7 @@ def main() -> None:
         embedding_model=settings.openai_embedding_model,
         vision_model=settings.openai_vision_model,
     )
+    llm.warmup_in_background()
 
     service = IngestionService(settings=settings, db=db, vectors=vectors, llm=llm)
     stats = service.ingest()
@@ -7,6 +7,7 @@ from app.fx import FxService
 from app.openai_client import OpenAIClient
 from app.pricing import PricingCatalog
 from app.query_context import QueryContext
+from app.retrieval import RetrievalResult
 
 
 def _service(tmp_path: Path) -> ChatService:
@@ -95,3 +96,30 @@ def test_ensure_structured_answer_adds_required_sections(tmp_path: Path) -> None
     assert "Direct Answer:" in structured
     assert "Explanation from Chopai:" in structured
     assert "Grounding:" in structured
+
+
+def test_agentic_retrieve_searches_pending_queries_once(tmp_path: Path) -> None:
+    service = _service(tmp_path)
+    searched: list[str] = []
+
+    class _Retrieval:
+        def search(self, *, query: str, **_) -> list[RetrievalResult]:
+            searched.append(query)
+            unit = _unit()
+            unit.id = f"u-{query}"
+            return [RetrievalResult(unit=unit, score=1.0)]
+
+    service.retrieval = _Retrieval()  # type: ignore[assignment]
+    prefetched = {"question": [RetrievalResult(unit=_unit(), score=1.0)]}
+
+    ranked = service._agentic_retrieve(  # noqa: SLF001
+        queries=["question", "a", "b", "c"],
+        style="en",
+        top_k=4,
+        granth=None,
+        prakran=None,
+        prefetched=prefetched,
+    )
+
+    assert sorted(searched) == ["a", "b", "c"]
+    assert [unit.id for unit, _ in ranked] == ["u1", "u-a", "u-b", "u-c"]
@@ -0,0 +1,79 @@
+import uuid
+from pathlib import Path
+
+import pytest
+
+from app import ingestion
+from app.config import Settings
+from app.db import Database
+from app.ingestion import IngestionService, _stable_unit_id
+from app.openai_client import OpenAIClient
+from app.pdf_extract import PageText
+
+
+class _NoVectors:
+    available = False
+
+
+def test_stable_unit_id_matches_uuid5() -> None:
+    for value in ["", "/tmp/a.pdf|1|0|Prakran 1|text", "/tmp/ग्रंथ.pdf|3|7|પ્રકરણ 2|ચોપાઈ"]:
+        assert _stable_unit_id(value) == str(uuid.uuid5(uuid.NAMESPACE_URL, value))
+
+
+def test_ingest_stores_records_in_batches(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    corpus = tmp_path / "hindi-arth"
+    corpus.mkdir()
+    for name in ["1ShriRas.pdf", "2ShriPrakash.pdf"]:
+        (corpus / name).write_bytes(b"%PDF-1.4")
+
+    def fake_extract(pdf_path: Path, **_: object) -> tuple[list[PageText], int]:
+        text = "\n".join(["-3-", "chopai line one", "chopai line two JJ 1", "meaning of the chopai"])
+        return [PageText(page_number=1, text=text, extraction_method="pdf", quality_score=0.9)], 0
+
+    monkeypatch.setattr(ingestion, "extract_pdf_pages", fake_extract)
+    monkeypatch.setattr(ingestion, "_UPSERT_BATCH_SIZE", 1)
+
+    db = Database(tmp_path / "app.db")
+    db.init_db()
+    settings = Settings(workspace_root=tmp_path, corpus_dirs=[str(corpus)], enable_ocr_fallback=False)
+    llm = OpenAIClient(api_key=None, chat_model="x", embedding_model="y", vision_model="z")
+    stats = IngestionService(settings=settings, db=db, vectors=_NoVectors(), llm=llm).ingest()  # type: ignore[arg-type]
+
+    assert stats.files_processed == 2
+    assert stats.chunks_created == db.count_units() == 2
+    assert len(db.search_fts("chopai", limit=10)) == 2
+
+
+def test_ingest_replaces_a_broken_parse_pool(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    corpus = tmp_path / "hindi-arth"
+    corpus.mkdir()
+    for name in ["1ShriRas.pdf", "2ShriPrakash.pdf", "3ShriKalash.pdf"]:
+        (corpus / name).write_bytes(b"%PDF-1.4")
+
+    def fake_extract(pdf_path: Path, **_: object) -> tuple[list[PageText], int]:
+        text = "\n".join(["chopai line one", "chopai line two JJ 1", f"meaning of {pdf_path.stem}"])
+        return [PageText(page_number=1, text=text, extraction_method="pdf", quality_score=0.9)], 0
+
+    class _FakePool:
+        def __init__(self, broken: bool) -> None:
+            self._broken = broken
+            self.shut_down = False
+
+        def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+            self.shut_down = True
+
+    # The first pool is already broken when the first PDF is done; its replacement is healthy.
+    pools = [_FakePool(broken=True), _FakePool(broken=False)]
+    monkeypatch.setattr(ingestion, "extract_pdf_pages", fake_extract)
+    monkeypatch.setattr(IngestionService, "_new_parse_pool", lambda self: pools.pop(0) if pools else None)
+    created = list(pools)
+
+    db = Database(tmp_path / "app.db")
+    db.init_db()
+    settings = Settings(workspace_root=tmp_path, corpus_dirs=[str(corpus)], enable_ocr_fallback=False)
+    llm = OpenAIClient(api_key=None, chat_model="x", embedding_model="y", vision_model="z")
+    stats = IngestionService(settings=settings, db=db, vectors=_NoVectors(), llm=llm).ingest()  # type: ignore[arg-type]
+
+    assert stats.files_processed == 3 and stats.failed_files == 0
+    assert pools == [] and all(pool.shut_down for pool in created)
+    assert sum("restarted" in note for note in stats.notes) == 1
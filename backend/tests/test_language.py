@@ -1,4 +1,4 @@
-from app.language import detect_style, query_variants
+from app.language import detect_style, normalize_text, query_variants
 
 
 def test_detect_style_hindi_script() -> None:
@@ -20,3 +20,49 @@ def test_detect_style_gujarati_roman() -> None:
 def test_query_variants_not_empty() -> None:
     variants = query_variants("kaise ho", "hi_latn")
     assert variants
+
+
+def test_normalize_text_handles_short_and_long_inputs_alike() -> None:
+    short = "  कैसे \n\t हो  "
+    assert normalize_text(short) == "कैसे हो"
+    assert normalize_text(short * 2000) == " ".join(["कैसे हो"] * 2000)
+
+
+def test_count_scripts_vector_path_matches_run_counts(monkeypatch) -> None:
+    from app import language
+
+    text = "नमस्ते abc કેમ છો 12 ÀZ [`@] " * 40
+    vectorized = language._count_scripts.__wrapped__(text)
+    monkeypatch.setattr(language, "np", None)
+    assert language._count_scripts.__wrapped__(text) == vectorized == language.ScriptCounts(devanagari=240, gujarati=200, latin=160)
+
+
+def test_normalize_lines_matches_per_line_normalize_text() -> None:
+    from app.language import normalize_lines
+
+    text = "  ﬁrst  line \t\r\ńaccent\nक़  ख\x0c१२  \n\n ＡＢＣ "
+    assert normalize_lines(text) == [normalize_text(line) for line in text.splitlines()]
+    assert normalize_lines("") == []
+
+
+def test_detect_style_and_transliteration_reuse_cached_results() -> None:
+    from app import language
+    from app.language import transliterate_to_latin
+
+    language._detect_style_cached.cache_clear()
+    language._transliterate_to_latin_cached.cache_clear()
+
+    assert detect_style("kem cho,  tame") == detect_style(" kem cho, tame ")
+    assert transliterate_to_latin("धाम धनी") == transliterate_to_latin("धाम  धनी")
+    assert language._detect_style_cached.cache_info().hits == 1
+    assert language._transliterate_to_latin_cached.cache_info().hits == 1
+
+
+def test_normalize_digits_maps_indic_digits_and_keeps_other_text() -> None:
+    from app.language import normalize_digits
+
+    assert normalize_digits("प्रकरण १४ પ્રકરણ ૫") == "प्रकरण 14 પ્રકરણ 5"
+    line = "धाम धनी की बात"
+    assert normalize_digits(line) is line
+    assert normalize_digits("-14- prakran") == "-14- prakran"
+    assert normalize_digits("") == ""
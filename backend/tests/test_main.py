@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.models import ChatRequest, ChatResponse
+from app.response_cache import ResponseCache, chat_cache_key
+
+
+class _StubChatService:
+    def __init__(self) -> None:
+        self.messages: list[str] = []
+        self.on_respond: Callable[[ChatRequest], None] | None = None
+
+    def respond(self, payload: ChatRequest, on_progress=None) -> ChatResponse:
+        self.messages.append(payload.message)
+        if self.on_respond is not None:
+            self.on_respond(payload)
+        if payload.message == "boom":
+            raise RuntimeError("pipeline failed")
+        if on_progress is not None:
+            on_progress("citations", [])
+        return ChatResponse(
+            answer=f"answer to {payload.message}",
+            answer_style="en",
+            not_found=payload.message == "unknown",
+            citations=[],
+        )
+
+
+@pytest.fixture
+def chat_service(monkeypatch: pytest.MonkeyPatch) -> _StubChatService:
+    service = _StubChatService()
+    stats = SimpleNamespace(files_processed=0, chunks_created=0, failed_files=0, ocr_pages=0, notes=[])
+
+    def build_services(settings) -> main.Services:
+        return main.Services(
+            database=SimpleNamespace(),
+            vectors=SimpleNamespace(),
+            llm_client=SimpleNamespace(close_pdf_documents=lambda: None),
+            ingestion_service=SimpleNamespace(ingest=lambda: stats),
+            chat_service=service,
+            chat_executor=ThreadPoolExecutor(max_workers=4),
+        )
+
+    monkeypatch.setattr(main, "build_services", build_services)
+    monkeypatch.setattr(main, "_warm_up", lambda services: None)
+    monkeypatch.setattr(main, "chat_cache", ResponseCache(max_entries=100, ttl_seconds=300))
+    monkeypatch.setattr(main.rate_limiter, "max_per_minute", 100)
+    monkeypatch.setattr(main.rate_limiter, "tat", {})
+    return service
+
+
+def test_chat_routes_work_across_repeated_lifespans(chat_service: _StubChatService) -> None:
+    for turn in range(2):
+        with TestClient(main.app) as client:
+            response = client.post("/api/chat", json={"session_id": "s1", "message": f"hello {turn}"})
+            assert response.status_code == 200
+            assert response.json()["answer"] == f"answer to hello {turn}"
+
+
+def _stub_services(chat_service: _StubChatService) -> SimpleNamespace:
+    return SimpleNamespace(chat_service=chat_service, chat_executor=ThreadPoolExecutor(max_workers=2))
+
+
+def test_chat_stream_sends_citations_then_final_or_an_error(chat_service: _StubChatService) -> None:
+    with TestClient(main.app) as client:
+        ok = client.post("/api/chat/stream", json={"session_id": "s1", "message": "hello"})
+        failed = client.post("/api/chat/stream", json={"session_id": "s1", "message": "boom"})
+
+    events = [block.split("\n")[0] for block in ok.text.strip().split("\n\n")]
+    assert events == ["event: citations", "event: final"]
+    assert '"answer":"answer to hello"' in ok.text
+    assert failed.text.startswith("event: error\n")
+
+
+def test_chat_stream_joins_a_running_identical_chat(chat_service: _StubChatService) -> None:
+    payload = ChatRequest(session_id="s1", message="hello")
+    services = _stub_services(chat_service)
+
+    async def scenario() -> list[bytes]:
+        chat = asyncio.ensure_future(main._respond_and_cache(services, payload, chat_cache_key(payload)))
+        await asyncio.sleep(0)
+        events = [event async for event in main._chat_events(services, payload)]
+        await chat
+        return events
+
+    events = asyncio.run(scenario())
+
+    assert chat_service.messages == ["hello"]
+    assert len(events) == 1 and events[0].startswith(b"event: final")
+
+
+def test_chat_stream_caches_the_turn_after_the_client_disconnects(chat_service: _StubChatService) -> None:
+    payload = ChatRequest(session_id="s1", message="hello")
+    cache_key = chat_cache_key(payload)
+    stale = ChatRequest(session_id="s1", message="earlier")
+    main.chat_cache.put(chat_cache_key(stale), b"{}", group="s1")
+
+    async def scenario() -> None:
+        events = main._chat_events(_stub_services(chat_service), payload)
+        assert (await events.__anext__()).startswith(b"event: citations")
+        task = main._inflight_chats[cache_key]
+        await events.aclose()
+        await task
+
+    asyncio.run(scenario())
+
+    assert main.chat_cache.get(cache_key) is not None
+    assert main.chat_cache.get(chat_cache_key(stale)) is None
+
+
+def test_chat_serves_repeats_from_cache_but_not_not_found_answers(chat_service: _StubChatService) -> None:
+    with TestClient(main.app) as client:
+        first = client.post("/api/chat", json={"session_id": "s1", "message": "hello"})
+        repeat = client.post("/api/chat", json={"session_id": "s1", "message": "  Hello "})
+        for _ in range(2):
+            client.post("/api/chat", json={"session_id": "s1", "message": "unknown"})
+
+    assert repeat.content == first.content
+    assert chat_service.messages == ["hello", "unknown", "unknown"]
+
+
+def test_new_turn_invalidates_its_session_and_ingest_clears_the_cache(chat_service: _StubChatService) -> None:
+    with TestClient(main.app) as client:
+        for session_id, message in [("s1", "hello"), ("s2", "hello"), ("s1", "next"), ("s1", "hello"), ("s2", "hello")]:
+            client.post("/api/chat", json={"session_id": session_id, "message": message})
+        assert chat_service.messages == ["hello", "hello", "next", "hello"]
+
+        assert client.post("/api/ingest").status_code == 200
+        client.post("/api/chat", json={"session_id": "s2", "message": "hello"})
+
+    assert chat_service.messages == ["hello", "hello", "next", "hello", "hello"]
+
+
+def test_chat_batch_keeps_order_and_runs_sessions_concurrently_but_turns_in_order(
+    chat_service: _StubChatService,
+) -> None:
+    # The first turns of both sessions must be in respond at once to pass the barrier.
+    barrier = threading.Barrier(2, timeout=5)
+    lock = threading.Lock()
+    active: Counter[str] = Counter()
+    overlapping: list[str] = []
+
+    def on_respond(payload: ChatRequest) -> None:
+        with lock:
+            active[payload.session_id] += 1
+            if active[payload.session_id] > 1:
+                overlapping.append(payload.session_id)
+        if payload.message.endswith("1"):
+            barrier.wait()
+        with lock:
+            active[payload.session_id] -= 1
+
+    chat_service.on_respond = on_respond
+    items = [("s1", "a1"), ("s2", "b1"), ("s1", "a2"), ("s2", "b2"), ("s1", "a3")]
+    with TestClient(main.app) as client:
+        response = client.post(
+            "/api/chat/batch",
+            json={"items": [{"session_id": session_id, "message": message} for session_id, message in items]},
+        )
+
+    assert response.status_code == 200
+    assert [item["answer"] for item in response.json()["items"]] == [f"answer to {message}" for _, message in items]
+    assert [message for message in chat_service.messages if message.startswith("a")] == ["a1", "a2", "a3"]
+    assert overlapping == []
+
+
+def test_chat_batch_charges_one_rate_limit_slot_per_item(
+    chat_service: _StubChatService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(main.rate_limiter, "max_per_minute", 8)
+    batch = {"items": [{"session_id": f"s{index}", "message": "hello"} for index in range(5)]}
+    with TestClient(main.app) as client:
+        assert client.post("/api/chat/batch", json=batch).status_code == 200
+        assert client.post("/api/chat/batch", json=batch).status_code == 429
+        assert client.post("/api/chat", json={"session_id": "s9", "message": "hello"}).status_code == 200
+
+    assert len(chat_service.messages) == 6
+
+
+def test_identical_concurrent_chats_share_one_turn_and_survive_a_cancelled_waiter(
+    chat_service: _StubChatService,
+) -> None:
+    payload = ChatRequest(session_id="s1", message="hello")
+    cache_key = chat_cache_key(payload)
+    services = _stub_services(chat_service)
+    release = threading.Event()
+    chat_service.on_respond = lambda payload: release.wait(5)
+
+    async def scenario() -> tuple[asyncio.Future, ChatResponse]:
+        first = asyncio.ensure_future(main._respond_and_cache(services, payload, cache_key))
+        second = asyncio.ensure_future(main._respond_and_cache(services, payload, cache_key))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        response, _ = await second
+        return first, response
+
+    first, response = asyncio.run(scenario())
+
+    assert first.cancelled()
+    assert response.answer == "answer to hello"
+    assert chat_service.messages == ["hello"]
+    assert cache_key not in main._inflight_chats
@@ -0,0 +1,10 @@
+from app.ocr_cache import OcrCache
+
+
+def test_ocr_cache_round_trip_persists_across_instances(tmp_path) -> None:
+    path = tmp_path / "ocr_cache.db"
+    OcrCache(path).put("k1", "पहला पन्ना")
+
+    cache = OcrCache(path)
+    assert cache.get("k1") == "पहला पन्ना"
+    assert cache.get("missing") is None
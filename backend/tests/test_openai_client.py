@@ -1,5 +1,14 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from app import openai_client
 from app.db import RetrievedUnit
+from app.ocr_cache import OcrCache
 from app.openai_client import OpenAIClient
+from app.pricing import UsageCollector
 
 
 def _unit() -> RetrievedUnit:
@@ -65,3 +74,249 @@ def test_embed_fallback_produces_nonempty_vector() -> None:
 
     assert len(vector) > 0
     assert any(value != 0 for value in vector)
+
+
+def test_hash_embedding_numpy_path_matches_pure_python(monkeypatch) -> None:
+    pytest.importorskip("numpy")
+    text = "Prakran 14 chaupai 4 prakran shri ras"
+    openai_client._hash_embedding_cached.cache_clear()
+    vectorized = openai_client._hash_embedding(text, dim=1536)
+    openai_client._hash_embedding_cached.cache_clear()
+    monkeypatch.setattr(openai_client, "np", None)
+    reference = openai_client._hash_embedding(text, dim=1536)
+
+    assert vectorized == pytest.approx(reference, abs=1e-12)
+
+
+def test_hash_embedding_is_cached_per_token_sequence() -> None:
+    openai_client._hash_embedding_cached.cache_clear()
+    first = openai_client._hash_embedding("Shri  Ras prakran", dim=64)
+    second = openai_client._hash_embedding(" shri ras\nPRAKRAN ", dim=64)
+
+    assert first == second
+    assert openai_client._hash_embedding_cached.cache_info().hits == 1
+    first[0] = 99.0
+    assert openai_client._hash_embedding("shri ras prakran", dim=64)[0] != 99.0
+
+
+def test_hash_embedding_tokens_ignore_punctuation() -> None:
+    assert openai_client._hash_embedding("धाम, धनी।", dim=64) == openai_client._hash_embedding("धाम धनी", dim=64)
+    assert openai_client._hash_embedding("kem cho?", dim=64) == openai_client._hash_embedding("Kem  CHO", dim=64)
+    assert openai_client._hash_embedding("धाम", dim=64) != openai_client._hash_embedding("धनी", dim=64)
+
+
+def test_embed_many_keeps_order_across_concurrent_batches() -> None:
+    class _Embeddings:
+        def create(self, *, model: str, input: list[str]):
+            if input[0] == "t64":
+                raise RuntimeError("boom")
+            # Out of order on purpose; the client places vectors by index.
+            data = [
+                SimpleNamespace(index=i, embedding=[float(text[1:]), 1.0]) for i, text in reversed(list(enumerate(input)))
+            ]
+            return SimpleNamespace(data=data, usage=SimpleNamespace(prompt_tokens=len(input), total_tokens=len(input)))
+
+    client = OpenAIClient(api_key=None, chat_model="x", embedding_model="y", vision_model="z")
+    client.client = SimpleNamespace(embeddings=_Embeddings())
+    client.enabled = True
+    collector = UsageCollector()
+
+    vectors = client.embed_many([f"t{i}" for i in range(200)], usage_collector=collector)
+
+    assert len(vectors) == 200
+    assert [vector[0] for vector in vectors[:64]] == [float(i) for i in range(64)]
+    assert len(vectors[64]) == 2 and vectors[64][0] != 64.0
+    assert [vector[0] for vector in vectors[128:]] == [float(i) for i in range(128, 200)]
+    assert sum(event.input_tokens for event in collector.events) == 136
+    assert client.last_embedding_error is None
+
+
+def test_embed_many_sends_duplicate_texts_once() -> None:
+    sent: list[list[str]] = []
+
+    class _Embeddings:
+        def create(self, *, model: str, input: list[str]):
+            sent.append(list(input))
+            data = [SimpleNamespace(index=i, embedding=[float(len(text)), 1.0]) for i, text in enumerate(input)]
+            return SimpleNamespace(data=data, usage=SimpleNamespace(prompt_tokens=len(input), total_tokens=len(input)))
+
+    client = OpenAIClient(api_key=None, chat_model="x", embedding_model="y", vision_model="z")
+    client.client = SimpleNamespace(embeddings=_Embeddings())
+    client.enabled = True
+
+    vectors = client.embed_many(["aa", "b", " aa ", "ccc", "b"])
+
+    assert sent == [["aa", "b", "ccc"]]
+    assert [vector[0] for vector in vectors] == [2.0, 1.0, 2.0, 3.0, 1.0]
+
+
+def test_ocr_pdf_page_reuses_disk_cache_after_restart(tmp_path) -> None:
+    calls: list[int] = []
+
+    def _client() -> OpenAIClient:
+        client = OpenAIClient(
+            api_key=None,
+            chat_model="x",
+            embedding_model="y",
+            vision_model="z",
+            ocr_cache=OcrCache(tmp_path / "ocr_cache.db"),
+        )
+        client.client = SimpleNamespace(
+            responses=SimpleNamespace(
+                create=lambda **_: calls.append(1) or SimpleNamespace(output_text="page text", usage=None)
+            )
+        )
+        client.enabled = True
+        client._pdf_page_to_data_url = lambda pdf_path, page_number: "data:image/png;base64,aW1hZ2U="
+        return client
+
+    assert _client().ocr_pdf_page("/tmp/x.pdf", 3) == "page text"
+    assert _client().ocr_pdf_page("/tmp/x.pdf", 3) == "page text"
+    assert len(calls) == 1
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache = openai_client._LRUCache(maxsize=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert len(cache) == 2
+
+
+def test_pdf_documents_are_reused_until_file_changes(tmp_path) -> None:
+    fitz = pytest.importorskip("fitz")
+    pdf_path = tmp_path / "granth.pdf"
+    document = fitz.open()
+    document.new_page()
+    document.new_page()
+    document.save(str(pdf_path))
+    document.close()
+
+    client = OpenAIClient(api_key=None, chat_model="x", embedding_model="y", vision_model="z")
+    assert client._pdf_page_to_data_url(str(pdf_path), 1).startswith("data:image/")
+    first = client._pdf_documents[str(pdf_path)][1]
+    client._pdf_page_to_data_url(str(pdf_path), 2)
+    assert client._pdf_documents[str(pdf_path)][1] is first
+
+    stat = pdf_path.stat()
+    os.utime(pdf_path, (stat.st_atime, stat.st_mtime + 10))
+    client._pdf_page_to_data_url(str(pdf_path), 1)
+    assert client._pdf_documents[str(pdf_path)][1] is not first
+    client.close_pdf_documents()
+    assert not client._pdf_documents
+
+
+def test_extract_json_object_handles_fences_and_trailing_braces() -> None:
+    client = OpenAIClient(api_key=None, chat_model="x", embedding_model="y", vision_model="z")
+
+    assert client._extract_json_object('{"intent": "x"}') == {"intent": "x"}
+    fenced = '```json\n{"intent": "a {b}", "sub_queries": ["q\\"}"]}\n```\nNote: see {above}.'
+    assert client._extract_json_object(fenced) == {"intent": "a {b}", "sub_queries": ['q"}']}
+    assert client._extract_json_object("no json here") is None
+    assert client._extract_json_object("[1, 2]") is None
+
+
+def test_complete_reuses_low_temperature_replies_only() -> None:
+    calls: list[dict] = []
+
+    class _Responses:
+        def create(self, **kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(output_text=f"reply {len(calls)}", usage=None, output=[])
+
+    client = OpenAIClient(api_key=None, chat_model="x", embedding_model="y", vision_model="z")
+    client.client = SimpleNamespace(responses=_Responses())
+    client.enabled = True
+
+    assert client._complete("convert this", temperature=0.1) == "reply 1"
+    assert client._complete("convert this", temperature=0.1) == "reply 1"
+    assert client._complete("convert this", temperature=0.0) == "reply 2"
+    assert client._complete("answer this", temperature=0.2) == "reply 3"
+    assert client._complete("answer this", temperature=0.2) == "reply 4"
+    assert len(calls) == 4
+
+
+def test_responses_text_remembers_rejected_optional_parameters() -> None:
+    calls: list[dict] = []
+
+    class _Responses:
+        def create(self, **kwargs):
+            calls.append(kwargs)
+            if "temperature" in kwargs:
+                raise ValueError("Unsupported parameter: 'temperature'")
+            return SimpleNamespace(output_text="ok", usage=None, output=[])
+
+    client = OpenAIClient(api_key=None, chat_model="x", embedding_model="y", vision_model="z")
+    client.client = SimpleNamespace(responses=_Responses())
+    client.enabled = True
+
+    assert client._responses_text(model="x", input_payload="a", temperature=0.3, usage_stage="answer") == "ok"
+    assert client._responses_text(model="x", input_payload="b", temperature=0.3, usage_stage="answer") == "ok"
+    assert len(calls) == 3
+    # Only temperature was rejected; the prompt cache key is still sent.
+    assert calls[-1] == {"model": "x", "input": "b", "prompt_cache_key": "tartam-answer"}
+
+
+@pytest.mark.parametrize(
+    ("rejects", "message", "last_call"),
+    [
+        ({"prompt_cache_key"}, "Unknown parameter: 'prompt_cache_key'.", {"temperature": 0.3}),
+        ({"temperature", "prompt_cache_key"}, "Unsupported parameter for this model.", {}),
+    ],
+)
+def test_responses_text_drops_only_the_rejected_parameters(rejects: set[str], message: str, last_call: dict) -> None:
+    calls: list[dict] = []
+
+    class _Responses:
+        def create(self, **kwargs):
+            calls.append(kwargs)
+            if rejects & kwargs.keys():
+                raise ValueError(message)
+            return SimpleNamespace(output_text="ok", usage=None, output=[])
+
+    client = OpenAIClient(api_key=None, chat_model="x", embedding_model="y", vision_model="z")
+    client.client = SimpleNamespace(responses=_Responses())
+    client.enabled = True
+
+    for payload in ("a", "b"):
+        assert client._responses_text(model="x", input_payload=payload, temperature=0.3, usage_stage="answer") == "ok"
+    assert calls[-1] == {"model": "x", "input": "b", **last_call}
+    assert len(calls) == 2 + len(rejects)
+
+
+def test_extract_json_object_accepts_near_json_when_json5_is_installed() -> None:
+    pytest.importorskip("json5")
+    client = OpenAIClient(api_key=None, chat_model="x", embedding_model="y", vision_model="z")
+
+    reply = "Plan:\n{intent: 'lookup', sub_queries: ['a', 'b',],}\nthanks"
+    assert client._extract_json_object(reply) == {"intent": "lookup", "sub_queries": ["a", "b"]}
+
+
+def test_extract_json_object_without_json5_gives_up_on_near_json(monkeypatch) -> None:
+    # A None entry makes "import json5" raise ImportError, as if it were not installed.
+    monkeypatch.setitem(sys.modules, "json5", None)
+    client = OpenAIClient(api_key=None, chat_model="x", embedding_model="y", vision_model="z")
+
+    assert client._extract_json_object("{intent: 'lookup',}") is None
+    assert client._extract_json_object('{"intent": "lookup"}') == {"intent": "lookup"}
+
+
+def test_loads_json_object_with_simdjson_returns_plain_dicts() -> None:
+    pytest.importorskip("simdjson")
+
+    parsed = openai_client._loads_json_object('{"intent": "x", "sub_queries": ["a"], "n": 1}')
+    assert type(parsed) is dict and parsed == {"intent": "x", "sub_queries": ["a"], "n": 1}
+    assert openai_client._loads_json_object("[1, 2]") is None
+
+
+def test_loads_json_object_without_simdjson_uses_the_general_parser(monkeypatch) -> None:
+    monkeypatch.setattr(openai_client, "simdjson", None)
+
+    assert openai_client._loads_json_object('{"intent": "x"}') == {"intent": "x"}
+    with pytest.raises(ValueError):
+        openai_client._loads_json_object("{intent: 'x'}")
@@ -1,6 +1,17 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
-from app.parsing import parse_pdf_to_units
+from app.parsing import (
+    _PRAKRAN_HINT,
+    _extract_chopai_number,
+    _looks_like_prakran,
+    _may_carry_prakran,
+    _starts_with_meaning_marker,
+    parse_pdf_to_units,
+)
 from app.pdf_extract import PageText
 
 
@@ -71,3 +82,67 @@ def test_split_meaning_marker_into_meaning_field() -> None:
     assert "chaupai line one" in first.chopai_lines[0].lower()
     assert "explanation block" in first.meaning_text.lower()
     assert "meaning:" not in first.meaning_text.lower()
+
+
+def _numbered_pages() -> list[PageText]:
+    pages = []
+    for number in range(1, 41):
+        lines = [f"-{number // 10 + 1}-"] if number % 10 == 1 else []
+        lines += [
+            f"chopai {number} first line",
+            f"chopai {number} second line JJ {number}",
+            "अर्थ: meaning shared by many pages",
+            f"page {number} closing words",
+        ]
+        pages.append(PageText(page_number=number, extraction_method="pdf", quality_score=0.8, text="\n".join(lines)))
+    return pages
+
+
+def test_parallel_page_parsing_matches_sequential() -> None:
+    pages = _numbered_pages()
+    pdf_path = Path("/tmp/13ShriSingaar.pdf")
+
+    sequential = parse_pdf_to_units(pdf_path, pages)
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+        parallel = parse_pdf_to_units(pdf_path, pages, executor=executor)
+
+    assert parallel == sequential
+    assert {unit.prakran_name for unit in parallel} == {"Prakran 1", "Prakran 2", "Prakran 3", "Prakran 4"}
+
+
+def test_page_parsing_falls_back_to_sequential_when_a_worker_dies() -> None:
+    pages = _numbered_pages()
+    pdf_path = Path("/tmp/13ShriSingaar.pdf")
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        assert isinstance(executor.submit(os._exit, 1).exception(), BrokenProcessPool)
+        units = parse_pdf_to_units(pdf_path, pages, executor=executor)
+
+    assert units == parse_pdf_to_units(pdf_path, pages)
+
+
+def test_prakran_prefilter_keeps_every_hint_line() -> None:
+    lines = ["-14-", "– शीर्षक", "प्रकरण 3", "પ્રકરણ ૫", "पकरण", "PraKaran 9", "PRAKRAN", "x -7- y"]
+    for line in lines:
+        assert _PRAKRAN_HINT.search(line)
+        assert _may_carry_prakran(line)
+    assert not _may_carry_prakran("धाम धनी की बात JJ 12")
+
+
+def test_extract_chopai_number_takes_last_trailing_digits() -> None:
+    assert _extract_chopai_number("धाम धनी की बात JJ 12 ") == "12"
+    assert _extract_chopai_number("line ॥ ४५") == "४५"
+    assert _extract_chopai_number("12345") == "2345"
+    assert _extract_chopai_number("chopai 12 line") is None
+    assert _extract_chopai_number("") is None
+
+
+def test_keyword_fast_paths_fold_case_like_the_regexes() -> None:
+    assert _looks_like_prakran("PraKaran 9")
+    assert _looks_like_prakran("पकरण ४")
+    assert not _looks_like_prakran("prakrn 9")
+    assert not _looks_like_prakran("prakran " + "x" * 120)
+    assert _starts_with_meaning_marker("ARTHA: text")
+    assert _starts_with_meaning_marker("  Meaning - text")
+    assert _starts_with_meaning_marker("भावार्थ: ...")
+    assert not _starts_with_meaning_marker("the meaning: text")
@@ -0,0 +1,138 @@
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from app.pdf_extract import _text_quality_score, extract_pdf_pages
+
+
+def _reference_score(text: str) -> float:
+    printable = sum(1 for ch in text if ch.isprintable())
+    alpha = sum(1 for ch in text if ch.isalpha())
+    weird = len(re.findall(r"[\x00-\x08\x0B\x0C\x0E-\x1F]", text))
+    return max(0.0, min(1.0, (0.6 * printable / len(text)) + (0.6 * alpha / len(text)) - (2.0 * weird / len(text))))
+
+
+def test_text_quality_score_matches_per_character_counts() -> None:
+    samples = [
+        "धाम धनी की बात\nसुनो सुंदरसाथ 12",
+        "plain\tascii text\r\nwith tabs",
+        "ctrl\x01chars\x1f here\x0b\n",
+        "Ÿ¢è ç¶H±¼\n‍­",
+    ]
+    for text in samples:
+        assert _text_quality_score(text) == pytest.approx(_reference_score(text), abs=1e-12)
+    assert _text_quality_score("") == 0.0
+
+
+def test_extract_pdf_pages_with_executor_matches_sequential(tmp_path: Path) -> None:
+    fitz = pytest.importorskip("fitz")
+    pdf_path = tmp_path / "granth.pdf"
+    document = fitz.open()
+    for number in range(1, 21):
+        document.new_page().insert_text((72, 72), f"-{number}- chopai line JJ {number}")
+    document.save(str(pdf_path))
+    document.close()
+
+    sequential, _ = extract_pdf_pages(pdf_path)
+    # Same executor setup as ingestion.
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+        parallel, _ = extract_pdf_pages(pdf_path, executor=executor)
+
+    assert parallel == sequential
+    assert [page.page_number for page in parallel] == list(range(1, 21))
+    assert all(f"JJ {page.page_number}" in page.text for page in parallel)
+
+
+def test_extract_pdf_pages_falls_back_when_a_worker_page_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fitz = pytest.importorskip("fitz")
+    from types import SimpleNamespace
+
+    from app import pdf_extract
+
+    pdf_path = tmp_path / "granth.pdf"
+    document = fitz.open()
+    for number in range(1, 21):
+        document.new_page().insert_text((72, 72), f"chopai line JJ {number}")
+    document.save(str(pdf_path))
+    document.close()
+
+    def broken_extract_text() -> str:
+        raise ValueError("broken content stream")
+
+    # Workers see page 5 fail; the in-process reader used by the fallback does not.
+    worker_pages = [SimpleNamespace(extract_text=lambda: "worker text") for _ in range(20)]
+    worker_pages[4] = SimpleNamespace(extract_text=broken_extract_text)
+    monkeypatch.setattr(pdf_extract, "_worker_reader", lambda path, mtime_ns: SimpleNamespace(pages=worker_pages))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pages, _ = extract_pdf_pages(pdf_path, executor=executor)
+
+    assert all(f"JJ {page.page_number}" in page.text for page in pages)
+
+
+def test_extract_pages_ocr_renders_adjacent_pages_together(monkeypatch: pytest.MonkeyPatch) -> None:
+    from types import SimpleNamespace
+
+    from app import pdf_extract
+
+    renders: list[tuple[int, int]] = []
+
+    def fake_convert(path: str, *, first_page: int, last_page: int, dpi: int) -> list[int]:
+        renders.append((first_page, last_page))
+        return list(range(first_page, last_page + 1))
+
+    monkeypatch.setattr(pdf_extract, "convert_from_path", fake_convert)
+    monkeypatch.setattr(pdf_extract, "pytesseract", SimpleNamespace(image_to_string=lambda image, lang: f"page {image}"))
+
+    texts = pdf_extract._extract_pages_ocr(Path("/tmp/x.pdf"), [2, 3, 4, 9, *range(20, 30)])
+
+    assert sorted(renders) == [(2, 4), (9, 9), (20, 27), (28, 29)]
+    assert texts == {number: f"page {number}" for number in [2, 3, 4, 9, *range(20, 30)]}
+
+
+def test_extract_pdf_pages_keeps_going_past_a_page_that_fails_to_load(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fitz = pytest.importorskip("fitz")
+    from app import pdf_extract
+
+    pdf_path = tmp_path / "granth.pdf"
+    document = fitz.open()
+    for number in range(1, 4):
+        document.new_page().insert_text((72, 72), f"chopai line JJ {number}")
+    document.save(str(pdf_path))
+    document.close()
+
+    page_text = pdf_extract._page_text
+
+    def flaky_page_text(page: object) -> str:
+        text = page_text(page)
+        if "JJ 2" in text:
+            raise ValueError("broken page object")
+        return text
+
+    monkeypatch.setattr(pdf_extract, "_page_text", flaky_page_text)
+    pages, _ = extract_pdf_pages(pdf_path)
+
+    assert [page.extraction_method for page in pages] == ["pdf", "error", "pdf"]
+    assert pages[1].text == "" and pages[1].quality_score == 0.0
+    assert "JJ 3" in pages[2].text
+
+
+def test_worker_reader_is_cached_per_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app import pdf_extract
+
+    monkeypatch.setattr(pdf_extract, "_open_reader", lambda path: object())
+    monkeypatch.setattr(pdf_extract, "_worker_local", threading.local())
+
+    first = pdf_extract._worker_reader("/tmp/x.pdf", 1)
+    assert pdf_extract._worker_reader("/tmp/x.pdf", 1) is first
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        other = pool.submit(pdf_extract._worker_reader, "/tmp/x.pdf", 1).result()
+    assert other is not first
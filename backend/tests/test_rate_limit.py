@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.rate_limit import InMemoryRateLimiter
+
+
+def test_rate_limiter_rejects_after_limit_per_client() -> None:
+    check = InMemoryRateLimiter(max_per_minute=2).dependency()
+    first = SimpleNamespace(client=SimpleNamespace(host="1.1.1.1"))
+    second = SimpleNamespace(client=SimpleNamespace(host="2.2.2.2"))
+
+    asyncio.run(check(first))
+    asyncio.run(check(first))
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(check(first))
+    assert exc_info.value.status_code == 429
+
+    asyncio.run(check(second))
+
+
+def test_rate_limiter_refills_one_slot_per_interval(monkeypatch) -> None:
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr("app.rate_limit.time.monotonic", lambda: clock.now)
+    check = InMemoryRateLimiter(max_per_minute=3).dependency()
+    client = SimpleNamespace(client=SimpleNamespace(host="1.1.1.1"))
+
+    for _ in range(3):
+        asyncio.run(check(client))
+    with pytest.raises(HTTPException):
+        asyncio.run(check(client))
+
+    clock.now += 20.0
+    asyncio.run(check(client))
+    with pytest.raises(HTTPException):
+        asyncio.run(check(client))
+
+
+def test_rate_limiter_check_charges_one_slot_per_unit_of_cost() -> None:
+    limiter = InMemoryRateLimiter(max_per_minute=8)
+    client = SimpleNamespace(client=SimpleNamespace(host="1.1.1.1"))
+
+    limiter.check(client, cost=6)
+    with pytest.raises(HTTPException):
+        limiter.check(client, cost=3)
+    limiter.check(client, cost=2)
+    with pytest.raises(HTTPException):
+        asyncio.run(limiter.dependency()(client))
@@ -0,0 +1,37 @@
+import time
+
+from app.models import ChatRequest
+from app.response_cache import ResponseCache, chat_cache_key
+
+
+def test_response_cache_evicts_least_recently_used() -> None:
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    cache.put(b"a", b"1", group="s1")
+    cache.put(b"b", b"2", group="s1")
+    assert cache.get(b"a") == b"1"
+
+    cache.put(b"c", b"3", group="s2")
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == b"1"
+    assert cache.get(b"c") == b"3"
+
+
+def test_response_cache_expires_and_invalidates_groups() -> None:
+    cache = ResponseCache(max_entries=10, ttl_seconds=0.01)
+    cache.put(b"a", b"1", group="s1")
+    time.sleep(0.02)
+    assert cache.get(b"a") is None
+
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    cache.put(b"a", b"1", group="s1")
+    cache.put(b"b", b"2", group="s2")
+    cache.invalidate_group("s1")
+    assert cache.get(b"a") is None
+    assert cache.get(b"b") == b"2"
+
+
+def test_chat_cache_key_ignores_case_and_spacing_only() -> None:
+    base = ChatRequest(session_id="s1", message="Kaise  ho")
+    assert chat_cache_key(base) == chat_cache_key(ChatRequest(session_id="s1", message="kaise ho "))
+    assert chat_cache_key(base) != chat_cache_key(ChatRequest(session_id="s2", message="kaise ho"))
+    assert chat_cache_key(base) != chat_cache_key(ChatRequest(session_id="s1", message="kaise ho", style_mode="hi"))